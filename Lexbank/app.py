@@ -1,54 +1,369 @@
+import json
 import os
-from typing import List, Tuple
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 import gradio as gr
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = os.getenv("API_BASE", "https://sr-bsm.onrender.com")
 TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "30"))
+POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "16"))
+POOL_BLOCK = os.getenv("API_POOL_BLOCK", "true").lower() == "true"
+MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.5"))
+STREAM_RESPONSES = os.getenv("API_STREAM", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SECONDS = float(os.getenv("API_CACHE_TTL_SECONDS", "300"))
+# At least one turn: the store indexes turns[0] when trimming to the token budget.
+SESSION_MAX_TURNS = max(1, int(os.getenv("SESSION_MAX_TURNS", "20")))
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "4000"))
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
 
 
-def chat(message: str, history: List[Tuple[str, str]], agent_type: str):
-    """Send message to LexBANK backend and append response to chat history."""
-    cleaned_message = (message or "").strip()
-    if not cleaned_message:
-        return history, ""
+def build_session() -> requests.Session:
+    """Create a keep-alive session with a bounded per-host pool.
+
+    Retries with backoff apply to idempotent methods only; chat POSTs are never replayed.
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        status=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+SESSION = build_session()
+
+
+def connection_stats() -> Dict[str, Any]:
+    """Report per-host connection reuse for the shared session."""
+    hosts: Dict[str, Dict[str, int]] = {}
+    # build_session mounts one adapter on both schemes; count each pool once.
+    adapters = {id(adapter): adapter for adapter in SESSION.adapters.values()}
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            stats = hosts.setdefault(host, {"requests": 0, "connections_opened": 0, "reused": 0})
+            stats["requests"] += pool.num_requests
+            stats["connections_opened"] += pool.num_connections
+            stats["reused"] += max(pool.num_requests - pool.num_connections, 0)
+    return {"pool_maxsize": POOL_MAXSIZE, "hosts": hosts}
+
+
+STREAMING_CONTENT_TYPES = ("text/event-stream", "text/plain")
+
+
+def _is_streaming(response: requests.Response) -> bool:
+    content_type = response.headers.get("Content-Type", "")
+    return any(kind in content_type for kind in STREAMING_CONTENT_TYPES)
+
+
+def iter_stream(response: requests.Response) -> Iterator[str]:
+    """Yield the accumulated reply as SSE events or plain chunks arrive."""
+    content_type = response.headers.get("Content-Type", "")
+    if "charset" not in content_type:
+        response.encoding = "utf-8"
+
+    text = ""
+    if "text/event-stream" not in content_type:
+        for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+            if chunk:
+                text += chunk
+                yield text
+        return
+
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            event = payload
+        if isinstance(event, dict):
+            if event.get("result"):
+                text = event["result"]
+            else:
+                text += event.get("delta") or event.get("token") or event.get("content") or ""
+        elif isinstance(event, str):
+            text += event
+        yield text
+
+
+class ReplyCache:
+    """Thread-safe LRU+TTL cache of backend replies with in-flight request coalescing."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], "_Flight"] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(agent_type: str, query: str) -> Tuple[str, str]:
+        normalized = " ".join(unicodedata.normalize("NFKC", query).split()).casefold()
+        return agent_type, normalized
+
+    def get(self, key: Tuple[str, str]) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def join(self, key: Tuple[str, str]) -> Tuple[bool, "_Flight"]:
+        """Return (is_leader, flight); followers wait on the leader's flight."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return False, flight
+            flight = self._inflight[key] = _Flight()
+            return True, flight
+
+    def complete(self, key: Tuple[str, str], reply: Optional[str]) -> None:
+        with self._lock:
+            flight = self._inflight.pop(key, None)
+            if reply is not None and self.max_entries > 0:
+                self._entries[key] = (time.monotonic(), reply)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        if flight is not None:
+            flight.reply = reply
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "coalesced": self.coalesced,
+                "inflight": len(self._inflight),
+            }
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.reply: Optional[str] = None
+
+    def wait(self, timeout: float) -> Optional[str]:
+        self.done.wait(timeout)
+        return self.reply
+
 
-    history = history or []
+REPLY_CACHE = ReplyCache(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
 
+
+def _request_reply(message: str, agent_type: str) -> Iterator[Tuple[str, bool]]:
+    """Yield (reply_so_far, cacheable) pairs; the last pair carries the final reply."""
     try:
-        response = requests.post(
+        with SESSION.post(
             f"{API_BASE}/api/control/run",
-            json={"agents": [agent_type], "query": cleaned_message},
+            json={"agents": [agent_type], "query": message, "stream": STREAM_RESPONSES},
             headers={
                 "Content-Type": "application/json",
+                "Accept": "text/event-stream, application/json" if STREAM_RESPONSES else "application/json",
                 "x-mode": "chat",
                 "x-actor": "huggingface-user",
             },
-            timeout=TIMEOUT_SECONDS,
-        )
-
-        if response.ok:
-            data = response.json()
-            bot_reply = data.get("result") or "تم استلام الرسالة"
-        else:
-            bot_reply = f"⚠️ خطأ: {response.status_code} - {response.text}"
+            timeout=(5, TIMEOUT_SECONDS),
+            stream=STREAM_RESPONSES,
+        ) as response:
+            if not response.ok:
+                yield f"⚠️ خطأ: {response.status_code} - {response.text}", False
+            elif STREAM_RESPONSES and _is_streaming(response):
+                bot_reply = ""
+                for bot_reply in iter_stream(response):
+                    yield bot_reply, False
+                yield bot_reply or "تم استلام الرسالة", bool(bot_reply)
+            else:
+                data = response.json()
+                yield data.get("result") or "تم استلام الرسالة", bool(data.get("result"))
 
     except requests.exceptions.Timeout:
-        bot_reply = "⏱️ انتهت مهلة الاتصال. يرجى المحاولة مرة أخرى."
+        yield "⏱️ انتهت مهلة الاتصال. يرجى المحاولة مرة أخرى.", False
     except requests.exceptions.ConnectionError:
-        bot_reply = "🔌 لا يمكن الاتصال بالخادم. تأكد من أن الخادم يعمل."
+        yield "🔌 لا يمكن الاتصال بالخادم. تأكد من أن الخادم يعمل.", False
     except Exception as error:
-        bot_reply = f"❌ خطأ غير متوقع: {str(error)}"
+        yield f"❌ خطأ غير متوقع: {str(error)}", False
+
+
+class ConversationStore:
+    """Server-side bounded chat history, keyed by session id.
+
+    Each session keeps at most ``max_turns`` turns and trims the oldest ones once the
+    approximate token count exceeds ``token_budget``. Sessions idle for longer than
+    ``idle_seconds`` (or beyond ``max_sessions``, least recently used first) are evicted.
+    """
+
+    def __init__(self, max_turns: int, token_budget: int, idle_seconds: float, max_sessions: int) -> None:
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+    def window(self, session_id: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            conversation = self._touch(session_id)
+            return list(conversation.turns)
+
+    def append(self, session_id: str, user_message: str, bot_reply: str) -> List[Tuple[str, str]]:
+        with self._lock:
+            conversation = self._touch(session_id)
+            if len(conversation.turns) == conversation.turns.maxlen:
+                conversation.tokens -= self._turn_tokens(conversation.turns[0])
+            turn = (user_message, bot_reply)
+            conversation.turns.append(turn)
+            conversation.tokens += self._turn_tokens(turn)
+            while len(conversation.turns) > 1 and conversation.tokens > self.token_budget:
+                conversation.tokens -= self._turn_tokens(conversation.turns.popleft())
+            return list(conversation.turns)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "max_turns": self.max_turns,
+                "token_budget": self.token_budget,
+                "evicted": self.evicted,
+            }
+
+    def _turn_tokens(self, turn: Tuple[str, str]) -> int:
+        return self.estimate_tokens(turn[0]) + self.estimate_tokens(turn[1])
+
+    def _touch(self, session_id: str) -> "_Conversation":
+        now = time.monotonic()
+        self._evict_idle(now)
+        conversation = self._sessions.get(session_id)
+        if conversation is None:
+            conversation = self._sessions[session_id] = _Conversation(self.max_turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        self._sessions.move_to_end(session_id)
+        conversation.last_seen = now
+        return conversation
+
+    def _evict_idle(self, now: float) -> None:
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_seen < self.idle_seconds:
+                break
+            del self._sessions[oldest_id]
+            self.evicted += 1
+
 
-    history.append((cleaned_message, bot_reply))
-    return history, ""
+class _Conversation:
+    __slots__ = ("turns", "tokens", "last_seen")
+
+    def __init__(self, max_turns: int) -> None:
+        self.turns: Deque[Tuple[str, str]] = deque(maxlen=max_turns)
+        self.tokens = 0
+        self.last_seen = 0.0
+
+
+CONVERSATIONS = ConversationStore(SESSION_MAX_TURNS, SESSION_TOKEN_BUDGET, SESSION_IDLE_SECONDS, SESSION_MAX_SESSIONS)
+
+
+def chat(message: str, session_id: Optional[str], agent_type: str):
+    """Send message to LexBANK backend and stream the reply into the session's chat window.
+
+    History lives in the server-side conversation store; the UI only passes the new message
+    and its session id, and receives the bounded window back.
+    Falls back to the blocking JSON response when the backend does not stream.
+    Cached replies are served directly, and identical in-flight queries share one backend call.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    history = CONVERSATIONS.window(session_id)
+    cleaned_message = (message or "").strip()
+    if not cleaned_message:
+        yield history, "", session_id
+        return
+
+    history.append((cleaned_message, "…"))
+    yield history, "", session_id
+
+    key = ReplyCache.key(agent_type, cleaned_message)
+    bot_reply = REPLY_CACHE.get(key)
+    if bot_reply is None:
+        is_leader, flight = REPLY_CACHE.join(key)
+        if not is_leader:
+            bot_reply = flight.wait(TIMEOUT_SECONDS)
+
+    if bot_reply is None:
+        cacheable_reply = None
+        try:
+            for bot_reply, cacheable in _request_reply(cleaned_message, agent_type):
+                history[-1] = (cleaned_message, bot_reply)
+                yield history, "", session_id
+                if cacheable:
+                    cacheable_reply = bot_reply
+        finally:
+            if is_leader:
+                REPLY_CACHE.complete(key, cacheable_reply)
+
+    yield CONVERSATIONS.append(session_id, cleaned_message, bot_reply), "", session_id
 
 
 def check_connection():
     """Validate backend health endpoint connectivity."""
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=5)
+        response = SESSION.get(f"{API_BASE}/health", timeout=5)
         if response.status_code == 200:
             return "✅ متصل"
         return f"⚠️ خطأ: {response.status_code}"
@@ -56,6 +371,15 @@ def check_connection():
         return "❌ غير متصل"
 
 
+def runtime_stats() -> Dict[str, Any]:
+    """Combine connection-pool, reply-cache and session-store counters for the status panel."""
+    return {
+        "connections": connection_stats(),
+        "cache": REPLY_CACHE.stats(),
+        "conversations": CONVERSATIONS.stats(),
+    }
+
+
 with gr.Blocks(title="LexBANK Chat") as demo:
     gr.Markdown(
         """
@@ -68,6 +392,7 @@ with gr.Blocks(title="LexBANK Chat") as demo:
 
     with gr.Row():
         with gr.Column(scale=3):
+            session_id = gr.State(None)
             chatbot = gr.Chatbot(label="المحادثة", height=500, rtl=True, elem_classes=["rtl-text"])
 
             with gr.Row():
@@ -98,10 +423,12 @@ with gr.Blocks(title="LexBANK Chat") as demo:
             status = gr.Textbox(label="حالة الاتصال", value="غير معروف", interactive=False)
 
             check_btn = gr.Button("🔍 فحص الاتصال")
+            pool_stats = gr.JSON(label="إحصاءات الاتصال والتخزين المؤقت")
 
-    submit.click(fn=chat, inputs=[msg, chatbot, agent_type], outputs=[chatbot, msg])
-    msg.submit(fn=chat, inputs=[msg, chatbot, agent_type], outputs=[chatbot, msg])
+    submit.click(fn=chat, inputs=[msg, session_id, agent_type], outputs=[chatbot, msg, session_id])
+    msg.submit(fn=chat, inputs=[msg, session_id, agent_type], outputs=[chatbot, msg, session_id])
     check_btn.click(fn=check_connection, outputs=status)
+    check_btn.click(fn=runtime_stats, outputs=pool_stats)
 
 
 if __name__ == "__main__":
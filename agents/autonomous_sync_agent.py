@@ -1,9 +1,40 @@
+import argparse
+import asyncio
 import json
 import os
+import random
+import re
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import requests
 
+from dns_state import DNSSnapshot, diff, file_digest, load_desired
+
+CLOUDFLARE_API_URL = "https://api.cloudflare.com/client/v4"
+DOH_URL = "https://cloudflare-dns.com/dns-query"
+# Named sync intervals from nexus.config.json, in seconds. "real-time" is a short poll.
+SYNC_INTERVALS = {"real-time": 30, "realtime": 30, "hourly": 3600, "daily": 86400}
+DNS_PER_PAGE = 100
+INTERVAL_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([smh]?)$")
+
+
+def parse_interval(value, default=30):
+    """Seconds for a named interval, a number, or a "30s"/"5m"/"1h" string."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if text in SYNC_INTERVALS:
+        return float(SYNC_INTERVALS[text])
+    match = INTERVAL_RE.match(text)
+    if not match:
+        return default
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
 
 class BSUNexusAgent:
     def __init__(self):
@@ -13,6 +44,43 @@ class BSUNexusAgent:
         self.cf_token = os.getenv("CLOUDFLARE_TOKEN")
         # Allow override from env while preserving config fallback.
         self.cf_zone = os.getenv("CLOUDFLARE_ZONE_ID") or self.config["infrastructure"]["zone_id"]
+        self.api_url = os.getenv("CLOUDFLARE_API_URL", CLOUDFLARE_API_URL).rstrip("/")
+        self.doh_url = os.getenv("NEXUS_DOH_URL", DOH_URL)
+        self.desired_path = (
+            os.getenv("NEXUS_DNS_DESIRED")
+            or self.config["infrastructure"].get("dns_desired_state")
+            or "docs/dns.desired.json"
+        )
+        self.snapshot_path = os.getenv("NEXUS_DNS_SNAPSHOT", ".cache/nexus/dns-snapshot.json")
+        self.per_page = int(os.getenv("NEXUS_DNS_PER_PAGE", DNS_PER_PAGE))
+        self.fetch_workers = int(os.getenv("NEXUS_DNS_FETCH_WORKERS", "4"))
+        self.dry_run = False
+        self.snapshot = None
+        self.last_batch = {}
+
+        sync_config = self.config.get("agents", {}).get("sync_manager", {})
+        self.sync_interval = parse_interval(os.getenv("NEXUS_SYNC_INTERVAL") or sync_config.get("sync_interval"))
+        self.full_sync_every = parse_interval(os.getenv("NEXUS_FULL_SYNC_SECONDS"), default=900)
+        self.max_backoff = parse_interval(os.getenv("NEXUS_MAX_BACKOFF_SECONDS"), default=600)
+
+        # One keep-alive session for the life of the process instead of a new TLS handshake per call.
+        self.session = requests.Session()
+        self.headers = {
+            "Authorization": f"Bearer {self.cf_token}",
+            "Content-Type": "application/json",
+        }
+        self.fingerprint = None
+        self.last_full_sync = 0.0
+        self.stats = {
+            "cycles": 0,
+            "probes": 0,
+            "full_syncs": 0,
+            "skipped": 0,
+            "errors": 0,
+            "overlaps": 0,
+            "pages": 0,
+            "batch_writes": 0,
+        }
 
     def log(self, action, status="INFO"):
         print(f"[{datetime.now().strftime('%H:%M:%S')}] [BSU-NEXUS] {action} | {status}")
@@ -28,25 +96,222 @@ class BSUNexusAgent:
             self.log("Missing Cloudflare zone id", "ERROR")
             return False
 
-        headers = {
-            "Authorization": f"Bearer {self.cf_token}",
-            "Content-Type": "application/json",
-        }
-
         try:
-            response = requests.get(
-                f"https://api.cloudflare.com/client/v4/zones/{self.cf_zone}/dns_records",
-                headers=headers,
-                timeout=15,
-            )
-            response.raise_for_status()
-        except requests.RequestException as exc:
+            snapshot = self.fetch_snapshot()
+        except (requests.RequestException, ValueError) as exc:
             self.log(f"Cloudflare API error: {exc}", "ERROR")
             return False
+        snapshot.save(self.snapshot_path)
+        self.snapshot = snapshot
+        self.log(f"Snapshot: {len(snapshot.records)} records", "INFO")
+
+        if os.path.exists(self.desired_path):
+            if not self.reconcile(snapshot):
+                return False
 
         self.log(f"DNS OK: {self.config['domain']}", "SUCCESS")
         return True
 
+    def _get_page(self, page):
+        response = self.session.get(
+            f"{self.api_url}/zones/{self.cf_zone}/dns_records",
+            headers=self.headers,
+            params={"page": page, "per_page": self.per_page},
+            timeout=15,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("success") is False:
+            raise ValueError(f"dns_records page {page}: {payload.get('errors')}")
+        self.stats["pages"] += 1
+        return payload
+
+    @staticmethod
+    def _compact(record):
+        kept = {key: record.get(key) for key in ("id", "type", "content", "ttl", "proxied", "comment")}
+        kept["name"] = record["name"].rstrip(".").lower()
+        if record.get("priority") is not None:
+            kept["priority"] = record["priority"]
+        return kept
+
+    def fetch_snapshot(self):
+        """Fetch page 1, then the remaining pages concurrently, into an indexed snapshot."""
+        first = self._get_page(1)
+        records = list(first.get("result") or [])
+        total_pages = (first.get("result_info") or {}).get("total_pages") or 1
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=min(self.fetch_workers, total_pages - 1)) as pool:
+                for payload in pool.map(self._get_page, range(2, total_pages + 1)):
+                    records.extend(payload.get("result") or [])
+        return DNSSnapshot([self._compact(record) for record in records])
+
+    def reconcile(self, snapshot):
+        """Diff against the desired-state file and apply it in one batch call (none if in sync)."""
+        try:
+            desired = load_desired(self.desired_path, self.config["domain"])
+        except (OSError, ValueError, KeyError) as exc:
+            self.log(f"Invalid desired state {self.desired_path}: {exc}", "ERROR")
+            return False
+
+        batch = diff(snapshot, desired)
+        self.last_batch = batch
+        if not batch:
+            self.log("DNS matches desired state", "SUCCESS")
+            return True
+
+        summary = ", ".join(f"{len(items)} {name}" for name, items in batch.items())
+        if self.dry_run:
+            self.log(f"Planned changes: {summary}", "PLAN")
+            return True
+
+        try:
+            response = self.session.post(
+                f"{self.api_url}/zones/{self.cf_zone}/dns_records/batch",
+                headers=self.headers,
+                json=batch,
+                timeout=30,
+            )
+            response.raise_for_status()
+            if response.json().get("success") is False:
+                raise ValueError(response.json().get("errors"))
+        except (requests.RequestException, ValueError) as exc:
+            self.log(f"DNS batch update failed: {exc}", "ERROR")
+            return False
+        self.stats["batch_writes"] += 1
+        self.log(f"Applied DNS changes: {summary}", "SUCCESS")
+        return True
+
+    def probe(self):
+        """Cheap change fingerprint: DNS record count plus the zone's SOA serial.
+
+        Cloudflare bumps the SOA serial on every record change; the count catches adds and
+        deletes even when the DoH lookup is unavailable. Returns None if the API probe fails.
+        """
+        try:
+            response = self.session.get(
+                f"{self.api_url}/zones/{self.cf_zone}/dns_records",
+                headers=self.headers,
+                params={"per_page": 1},
+                timeout=10,
+            )
+            response.raise_for_status()
+            total = response.json().get("result_info", {}).get("total_count")
+        except (requests.RequestException, ValueError) as exc:
+            self.log(f"Change probe failed: {exc}", "ERROR")
+            return None
+
+        serial = None
+        try:
+            answer = self.session.get(
+                self.doh_url,
+                params={"name": self.config["domain"], "type": "SOA"},
+                headers={"Accept": "application/dns-json"},
+                timeout=5,
+            )
+            answer.raise_for_status()
+            records = answer.json().get("Answer") or []
+            if records:
+                serial = records[0]["data"].split()[2]
+        except (requests.RequestException, ValueError, KeyError, IndexError):
+            pass
+        return {"total_count": total, "soa_serial": serial}
+
+    def sync_cycle(self):
+        """Probe, then run the full DNS verification only if the zone moved or it is overdue.
+
+        Returns False when the cycle hit an API error, so the scheduler can back off.
+        """
+        self.stats["cycles"] += 1
+        if not self.cf_token or not self.cf_zone:
+            return self.verify_dns()
+
+        self.stats["probes"] += 1
+        fingerprint = self.probe()
+        if fingerprint is None:
+            return False
+        # Editing the desired-state file also counts as a change.
+        fingerprint["desired"] = file_digest(self.desired_path)
+        overdue = time.monotonic() - self.last_full_sync >= self.full_sync_every
+        if fingerprint == self.fingerprint and not overdue:
+            self.stats["skipped"] += 1
+            self.log("No DNS changes detected", "SKIP")
+            return True
+
+        self.stats["full_syncs"] += 1
+        writes = self.stats["batch_writes"]
+        ok = self.verify_dns()
+        if ok:
+            if self.stats["batch_writes"] != writes:
+                # Our own write moved the serial (and maybe the count); fingerprint the zone as
+                # written so the next cycle does not mistake it for an outside change.
+                self.stats["probes"] += 1
+                written = self.probe()
+                fingerprint = dict(written, desired=fingerprint["desired"]) if written else None
+            self.fingerprint = fingerprint
+            self.last_full_sync = time.monotonic()
+        return ok
+
+    def next_delay(self, failures):
+        """Jittered interval (+/-10%), or capped exponential backoff with full jitter after errors."""
+        if failures:
+            return random.uniform(0, min(self.max_backoff, self.sync_interval * 2 ** failures))
+        return self.sync_interval * random.uniform(0.9, 1.1)
+
+    async def run_daemon(self, max_cycles=None):
+        """Run sync cycles on a jittered schedule until SIGINT/SIGTERM or ``max_cycles``.
+
+        A cycle runs in a worker thread. If one is still in flight when the next tick is due,
+        that tick is skipped rather than started concurrently.
+        """
+        self.log(f"Starting BSU Nexus daemon (interval {self.sync_interval:g}s)", "START")
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        failures = 0
+        started = 0
+        current = None
+        while not stop.is_set() and (max_cycles is None or started < max_cycles):
+            if current is not None and not current.done():
+                self.stats["overlaps"] += 1
+                self.log("Previous cycle still running; skipping tick", "WARN")
+            else:
+                if current is not None:
+                    failures = self._record_outcome(current, failures)
+                current = asyncio.ensure_future(asyncio.to_thread(self.sync_cycle))
+                started += 1
+                # Let short cycles finish before choosing the next delay, so backoff applies immediately.
+                await asyncio.wait({current}, timeout=self.sync_interval)
+                if current.done():
+                    failures = self._record_outcome(current, failures)
+                    current = None
+            if max_cycles is not None and started >= max_cycles:
+                break
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.next_delay(failures))
+            except asyncio.TimeoutError:
+                pass
+
+        if current is not None:
+            await asyncio.wait({current})
+        self.session.close()
+        self.log(f"Daemon stopped: {self.stats}", "DONE")
+
+    def _record_outcome(self, task, failures):
+        try:
+            ok = task.result()
+        except Exception as exc:
+            self.log(f"Sync cycle crashed: {exc}", "ERROR")
+            ok = False
+        if ok:
+            return 0
+        self.stats["errors"] += 1
+        return failures + 1
+
     def run(self):
         self.log("Starting BSU Nexus Cycle", "START")
         self.verify_dns()
@@ -54,4 +319,18 @@ class BSUNexusAgent:
 
 
 if __name__ == "__main__":
-    BSUNexusAgent().run()
+    parser = argparse.ArgumentParser(description="BSU Nexus sync agent")
+    parser.add_argument("--daemon", action="store_true", help="Keep running and sync on the configured interval")
+    parser.add_argument("--max-cycles", type=int, help="Stop the daemon after this many cycles")
+    parser.add_argument("--desired", help="Desired DNS state JSON (default: docs/dns.desired.json if present)")
+    parser.add_argument("--dry-run", action="store_true", help="Log planned DNS changes without writing them")
+    args = parser.parse_args()
+
+    agent = BSUNexusAgent()
+    agent.dry_run = args.dry_run
+    if args.desired:
+        agent.desired_path = args.desired
+    if args.daemon:
+        asyncio.run(agent.run_daemon(args.max_cycles))
+    else:
+        agent.run()
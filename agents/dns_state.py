@@ -0,0 +1,135 @@
+"""Indexed DNS record snapshots and desired-state diffs for the BSU Nexus agent."""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+# Fields compared when the desired record sets them; content is always compared.
+COMPARED_FIELDS = ("ttl", "proxied", "priority", "comment")
+WRITABLE_FIELDS = ("type", "name", "content") + COMPARED_FIELDS
+
+
+def normalize_name(name, domain):
+    """Fully qualified, lower-case record name; "@" and relative names are joined to ``domain``."""
+    name = (name or "@").strip().rstrip(".").lower()
+    domain = domain.rstrip(".").lower()
+    if name == "@":
+        return domain
+    if name == domain or name.endswith("." + domain):
+        return name
+    return f"{name}.{domain}"
+
+
+def normalize_content(record_type, content):
+    content = str(content).strip()
+    if record_type in {"CNAME", "NS", "MX", "PTR"}:
+        return content.rstrip(".").lower()
+    return content
+
+
+def record_key(record):
+    return record["name"], record["type"]
+
+
+class DNSSnapshot:
+    """Zone records indexed by (name, type), persisted as JSON between runs."""
+
+    def __init__(self, records, fetched_at=None):
+        self.records = records
+        self.fetched_at = fetched_at or datetime.now(timezone.utc).isoformat()
+        self.by_key = {}
+        for record in records:
+            self.by_key.setdefault(record_key(record), []).append(record)
+
+    def lookup(self, name, record_type):
+        return self.by_key.get((name, record_type), [])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"fetched_at": self.fetched_at, "records": self.records}, handle, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["records"], data.get("fetched_at"))
+
+
+def load_desired(path, domain):
+    """Read a desired-state file: {"prune": bool, "records": [{type, name, content, ...}]}.
+
+    Only (name, type) pairs listed in the file are managed unless ``prune`` is true, in which
+    case every other record in the zone is deleted.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    records = []
+    for item in data.get("records", []):
+        record = {key: item[key] for key in WRITABLE_FIELDS if key in item}
+        record["type"] = record["type"].upper()
+        record["name"] = normalize_name(record.get("name"), domain)
+        records.append(record)
+    return {"prune": bool(data.get("prune", False)), "records": records}
+
+
+def file_digest(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def _changed_fields(current, desired):
+    return {
+        field: desired[field]
+        for field in COMPARED_FIELDS
+        if field in desired and current.get(field) != desired[field]
+    }
+
+
+def diff(snapshot, desired):
+    """Minimal batch payload turning ``snapshot`` into ``desired``.
+
+    Within each managed (name, type), records whose content already matches are kept
+    (patched only if ttl/proxied/etc. differ). Leftover current records are repurposed for
+    missing contents via patch before anything is posted, and only then deleted. Returns
+    the Cloudflare batch body with empty lists omitted; ``{}`` means nothing to do.
+    """
+    posts, patches, deletes = [], [], []
+    wanted = {}
+    for record in desired["records"]:
+        wanted.setdefault(record_key(record), []).append(record)
+
+    for key, targets in wanted.items():
+        current = list(snapshot.by_key.get(key, []))
+        missing = []
+        for target in targets:
+            content = normalize_content(target["type"], target["content"])
+            match = next(
+                (r for r in current if normalize_content(r["type"], r["content"]) == content),
+                None,
+            )
+            if match is None:
+                missing.append(target)
+                continue
+            current.remove(match)
+            changes = _changed_fields(match, target)
+            if changes:
+                patches.append({"id": match["id"], **changes})
+        for target in missing:
+            if current:
+                reuse = current.pop(0)
+                patches.append({"id": reuse["id"], "content": target["content"], **_changed_fields(reuse, target)})
+            else:
+                posts.append(dict(target))
+        deletes.extend({"id": record["id"]} for record in current)
+
+    if desired["prune"]:
+        deletes.extend({"id": r["id"]} for key, rs in snapshot.by_key.items() if key not in wanted for r in rs)
+
+    batch = {"deletes": deletes, "patches": patches, "posts": posts}
+    return {name: items for name, items in batch.items() if items}
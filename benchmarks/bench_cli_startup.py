@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Compare process start-up and import time of the per-script CLIs with the unified ``bsm`` CLI.
+
+The baseline is the tree as it was just before scripts/bsm.py was added (override with
+``--baseline-rev``), extracted with ``git archive`` into a temp dir.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TARGET_MS = 100.0
+# (label, legacy argv relative to the tree, bsm argv); legacy None means there was no equivalent.
+CASES = [
+    ("bsm --help", None, ["scripts/bsm.py", "--help"]),
+    ("bsm list", None, ["scripts/bsm.py", "list"]),
+    ("validate --help", ["scripts/validate_agent.py", "--help"], ["scripts/bsm.py", "validate", "--help"]),
+    ("optimize --help", ["scripts/optimize_agent.py", "--help"], ["scripts/bsm.py", "optimize", "--help"]),
+    ("triage --help", ["scripts/pr_triage_weekly.py", "--help"], ["scripts/bsm.py", "triage", "--help"]),
+    ("report --help", ["scripts/generate_report_with_ai.py", "--help"], ["scripts/bsm.py", "report", "--help"]),
+]
+TRIVIAL = {"bsm --help", "bsm list"}
+
+
+def baseline_rev() -> str | None:
+    added = subprocess.run(
+        ["git", "log", "--diff-filter=A", "--format=%H", "-1", "--", "scripts/bsm.py"],
+        cwd=ROOT, capture_output=True, text=True,
+    ).stdout.strip()
+    return f"{added}^" if added else None
+
+
+def extract_tree(rev: str, target: Path) -> None:
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev, "scripts", "bsm_config"], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def measure(argv: list[str], cwd: Path, runs: int) -> dict[str, float] | None:
+    """Median wall time over ``runs`` processes, plus total/top import time from -X importtime."""
+    command = [sys.executable, *argv]
+    if subprocess.run(command, cwd=cwd, capture_output=True).returncode != 0:
+        return None
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=cwd, capture_output=True)
+        samples.append((time.perf_counter() - started) * 1000)
+    stderr = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=cwd, capture_output=True, text=True).stderr
+    top_level = {}
+    modules = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        modules += 1
+        # One space separates the column from a top-level name; nested imports are indented further.
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative_us)
+    heaviest = max(top_level, key=top_level.get) if top_level else "-"
+    return {
+        "wall_ms": statistics.median(samples),
+        "import_ms": sum(top_level.values()) / 1000,
+        "modules": modules,
+        "heaviest": f"{heaviest} ({top_level.get(heaviest, 0) / 1000:.1f} ms)",
+    }
+
+
+def fmt(result: dict[str, float] | None, missing: str = "failed") -> str:
+    if result is None:
+        return f"{missing:>9} {'':>10} {'':>7}"
+    return f"{result['wall_ms']:>7.1f}ms {result['import_ms']:>8.1f}ms {result['modules']:>7}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--baseline-rev", default=None, help="Git revision for the legacy scripts")
+    parser.add_argument("--check", action="store_true", help=f"Exit 1 if a trivial command exceeds {TARGET_MS:g} ms")
+    args = parser.parse_args()
+
+    bare = measure(["-c", "pass"], ROOT, args.runs)
+    print(f"interpreter floor (python -c pass): {bare['wall_ms']:.1f}ms")
+    rev = args.baseline_rev or baseline_rev()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_root = None
+        if rev:
+            try:
+                extract_tree(rev, Path(tmp))
+                legacy_root = Path(tmp)
+            except subprocess.CalledProcessError:
+                rev = f"{rev} (not found)"
+        print(f"baseline: {rev or 'unavailable'}")
+        print(f"{'command':<18} {'legacy wall':>9} {'imports':>10} {'modules':>7} | {'bsm wall':>9} {'imports':>10} {'modules':>7}  heaviest (bsm)")
+        over = []
+        for label, legacy_argv, new_argv in CASES:
+            legacy = measure(legacy_argv, legacy_root, args.runs) if legacy_argv and legacy_root else None
+            new = measure(new_argv, ROOT, args.runs)
+            if not legacy_argv:
+                legacy_col = fmt(None, "-")
+            elif legacy_root is None:
+                legacy_col = fmt(None, "n/a")
+            else:
+                legacy_col = fmt(legacy)
+            print(f"{label:<18} {legacy_col} | {fmt(new)}  {new['heaviest'] if new else ''}")
+            if label in TRIVIAL and (new is None or new["wall_ms"] > TARGET_MS):
+                over.append(label)
+
+    if over:
+        print(f"over {TARGET_MS:g} ms target: {', '.join(over)}")
+    else:
+        print(f"trivial commands within {TARGET_MS:g} ms target")
+    return 1 if args.check and over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark the header-only front-matter reader against the original full-file parse."""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from front_matter import clear_cache, extract_front_matter, loader
+
+WORDS = [
+    "agent", "report", "analysis", "pipeline", "review", "security", "deploy", "dataset",
+    "prompt", "context", "summary", "workflow", "policy", "token", "insight", "metric",
+]
+
+
+def legacy_extract(path: Path) -> dict[str, Any]:
+    """The original ``validate_agent.extract_front_matter``."""
+    content = path.read_text(encoding="utf-8")
+    if content.startswith("---\n"):
+        chunks = content.split("---\n", 2)
+        if len(chunks) >= 3:
+            parsed = yaml.safe_load(chunks[1])
+            if isinstance(parsed, dict):
+                return parsed
+    parsed = yaml.safe_load(content)
+    if isinstance(parsed, dict):
+        return parsed
+    raise ValueError("File does not contain a YAML object or YAML front matter")
+
+
+def synthetic_agent(rng: random.Random, index: int, body_kb: int) -> str:
+    actions = "\n".join(
+        f"  - name: Step {step}\n    run: python scripts/{rng.choice(WORDS)}.py --input ./data/{step}.csv"
+        for step in range(rng.randint(2, 8))
+    )
+    header = (
+        f"---\nname: agent-{index}\ndescription: {' '.join(rng.choices(WORDS, k=12))}\n"
+        f"version: 1.{index % 10}.0\nauthor: BSM\nlicense: MIT\n"
+        f"triggers:\n  - event: push\n    conditions:\n      - files_changed: [\"data/*.csv\"]\n"
+        f"actions:\n{actions}\npermissions:\n  contents: read\n---\n"
+    )
+    body: list[str] = []
+    size = 0
+    while size < body_kb * 1024:
+        line = f"## {rng.choice(WORDS).title()}\n\n{' '.join(rng.choices(WORDS, k=40))}\n\n"
+        body.append(line)
+        size += len(line)
+    return header + "".join(body)
+
+
+def write_corpus(directory: Path, count: int, body_kb: int, seed: int = 7) -> list[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        path = directory / f"agent-{index}.agent.md"
+        path.write_text(synthetic_agent(rng, index, body_kb), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def timed(func: Any, paths: list[Path]) -> tuple[float, list[dict[str, Any]]]:
+    started = time.perf_counter()
+    results = [func(path) for path in paths]
+    return time.perf_counter() - started, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--body-kb", type=int, default=32, help="Markdown body size per file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_corpus(Path(tmp), args.count, args.body_kb)
+        legacy_seconds, legacy = timed(legacy_extract, paths)
+        clear_cache()
+        cold_seconds, cold = timed(extract_front_matter, paths)
+        warm_seconds, _ = timed(extract_front_matter, paths)
+
+    mismatches = sum(1 for old, new in zip(legacy, cold) if old != new)
+    print(f"files:      {len(paths)} (~{args.body_kb} KB body each, loader {loader().__name__})")
+    print(f"legacy:     {legacy_seconds:.3f}s ({len(paths) / legacy_seconds:,.0f} files/s)")
+    print(f"header:     {cold_seconds:.3f}s ({legacy_seconds / cold_seconds:.1f}x)")
+    print(f"cached:     {warm_seconds:.3f}s ({legacy_seconds / warm_seconds:.1f}x)")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
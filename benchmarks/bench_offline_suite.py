@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""Offline latency/throughput suite for the networked hot paths, with stored baselines.
+
+Every external service is replaced by a local stand-in (see stub_servers.py) or an
+in-process fake provider, so the suite runs on any Linux box without network:
+
+    lexbank.chat[sse|json]      Lexbank/app.py ``chat`` against a stub LexBANK backend
+    providers.routed_batch      ``APIClientFactory`` routed batch over FakeProviderClient
+    github.fetch_pulls[cold]    ``fetch_pulls`` against a stub GitHub pulls listing, no ETag cache
+    github.fetch_pulls[etag]    the same with a primed ETag cache, so every page is a 304
+    validate_agent[cold|warm]   ``bsm validate`` over a synthetic agent-file corpus
+    nexus.verify_dns            ``BSUNexusAgent.verify_dns`` against a stub Cloudflare API
+
+Scenarios whose dependencies are not installed are skipped. ``--update-baseline`` records
+the results in baselines.json; ``--check`` exits 1 when p50 latency or throughput regresses
+beyond ``--tolerance``, with extra slack when a CPU calibration run shows a slower machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "scripts", ROOT / "agents", ROOT / "Lexbank", ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from stub_servers import CloudflareStub, GitHubStub, LexbankStub, StubProfile, StubState
+
+DEFAULT_BASELINES_PATH = Path(__file__).resolve().with_name("baselines.json")
+WORK_DIR = ROOT / ".cache" / "bench"
+CORPUS_FILES = 200
+CORPUS_BODY_KB = 8
+# Error-rate slack on top of the baseline before a run counts as a regression.
+ERROR_RATE_SLACK = 0.05
+
+# An operation returns (units processed, succeeded).
+Operation = Callable[[], "tuple[int, bool]"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    unit: str
+    iterations: int
+    requires: tuple[str, ...]
+    setup: Callable[[StubProfile], "contextlib.AbstractContextManager[Operation]"]
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@contextlib.contextmanager
+def environment(**values: str) -> Iterator[None]:
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def lexbank_chat(profile: StubProfile, stream: bool) -> Iterator[Operation]:
+    with LexbankStub(StubState(profile)) as stub, environment(API_BASE=stub.url):
+        sys.modules.pop("app", None)
+        with warnings.catch_warnings():
+            # Building the Gradio UI at import warns about deprecated Chatbot defaults.
+            warnings.simplefilter("ignore")
+            import app
+
+        app.STREAM_RESPONSES = stream
+        counter = iter(range(1 << 30))
+
+        def op() -> tuple[int, bool]:
+            turn = next(counter)
+            # Unique messages so every turn reaches the backend instead of the reply cache.
+            history: list[Any] = []
+            for history, _, _ in app.chat(f"benchmark question {turn}", f"bench-{turn % 8}", "agent-auto"):
+                pass
+            reply = history[-1][1] if history else ""
+            return 1, not reply.startswith(("⚠️", "⏱️", "🔌", "❌"))
+
+        yield op
+
+
+@contextlib.contextmanager
+def providers_routed_batch(profile: StubProfile) -> Iterator[Operation]:
+    from bsm_config.src.api.client_factory import APIClientFactory
+    from bsm_config.src.api.fake_provider import FakeProviderClient
+
+    names = ["fake-primary", "fake-secondary"]
+    clients = {
+        name: FakeProviderClient(
+            name, latency=profile.latency, jitter=profile.jitter, error_rate=profile.error_rate, seed=profile.seed + i
+        )
+        for i, name in enumerate(names)
+    }
+    factory = APIClientFactory(names, clients=clients, cache=None)
+    body = "x" * profile.payload_bytes
+    batch_size = 16
+
+    def op() -> tuple[int, bool]:
+        results = factory.generateReportBatch([{"title": f"Report {i}", "body": body} for i in range(batch_size)])
+        return batch_size, all(result.ok for result in results)
+
+    yield op
+
+
+@contextlib.contextmanager
+def github_fetch_pulls(profile: StubProfile, etag_cache: bool) -> Iterator[Operation]:
+    from github_http import GitHubClient
+    from pr_triage_weekly import fetch_pulls
+
+    cache_dir = WORK_DIR / "github" if etag_cache else None
+    if cache_dir:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    with GitHubStub(StubState(profile)) as stub, GitHubClient(
+        api_url=stub.url, cache_dir=cache_dir, token="offline"
+    ) as client:
+
+        def op() -> tuple[int, bool]:
+            not_modified = client.stats["not_modified"]
+            try:
+                pulls = fetch_pulls("bsm/offline", "open", client=client)
+            except Exception:
+                return 0, False
+            complete = len(pulls) == stub.state.pull_count
+            # A warm run only counts as a success if every page was revalidated with a 304.
+            if etag_cache:
+                pages = -(-stub.state.pull_count // 100)
+                complete = complete and client.stats["not_modified"] - not_modified == pages
+            return len(pulls), complete
+
+        if etag_cache:
+            op()  # prime the ETag cache outside the measured and warm-up runs
+        try:
+            yield op
+        finally:
+            if cache_dir:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def validate_corpus(profile: StubProfile, cold: bool) -> Iterator[Operation]:
+    import bsm
+    from bench_front_matter import write_corpus
+
+    corpus = WORK_DIR / "agents"
+    shutil.rmtree(corpus, ignore_errors=True)
+    corpus.mkdir(parents=True)
+    write_corpus(corpus, CORPUS_FILES, CORPUS_BODY_KB, seed=profile.seed)
+    argv = [
+        "--glob", str(corpus / "*.agent.md"),
+        "--index", str(WORK_DIR / "agent-index.json"),
+        "--cache-file", str(WORK_DIR / "agent-validation.json"),
+    ]
+    if cold:
+        argv.append("--no-cache")
+
+    def op() -> tuple[int, bool]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = bsm.run("validate", argv)
+        return CORPUS_FILES, code == 0
+
+    try:
+        yield op
+    finally:
+        shutil.rmtree(corpus, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def nexus_verify_dns(profile: StubProfile) -> Iterator[Operation]:
+    state = StubState(profile)
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    desired = WORK_DIR / "dns.desired.json"
+    # One drifted record and one missing record, so every run diffs and sends a batch write.
+    drifted = {**state.dns_record(1), "ttl": 600}
+    missing = {"type": "TXT", "name": "bench", "content": "offline-benchmark", "ttl": 300}
+    desired.write_text(json.dumps({"prune": False, "records": [drifted, missing]}), encoding="utf-8")
+
+    with CloudflareStub(state) as stub, environment(
+        CLOUDFLARE_TOKEN="offline",
+        CLOUDFLARE_API_URL=stub.url,
+        NEXUS_DNS_DESIRED=str(desired),
+        NEXUS_DNS_SNAPSHOT=str(WORK_DIR / "dns-snapshot.json"),
+    ):
+        from autonomous_sync_agent import BSUNexusAgent
+
+        cwd = os.getcwd()
+        # The agent reads docs/nexus.config.json relative to the working directory.
+        os.chdir(ROOT)
+        try:
+            agent = BSUNexusAgent()
+        finally:
+            os.chdir(cwd)
+
+        def op() -> tuple[int, bool]:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ok = agent.verify_dns()
+            return state.dns_record_count, ok
+
+        yield op
+
+
+SCENARIOS = [
+    Scenario("lexbank.chat[sse]", "msg", 200, ("requests", "gradio"), lambda p: lexbank_chat(p, stream=True)),
+    Scenario("lexbank.chat[json]", "msg", 200, ("requests", "gradio"), lambda p: lexbank_chat(p, stream=False)),
+    Scenario("providers.routed_batch", "call", 50, (), providers_routed_batch),
+    Scenario("github.fetch_pulls[cold]", "pr", 30, (), lambda p: github_fetch_pulls(p, etag_cache=False)),
+    Scenario("github.fetch_pulls[etag]", "pr", 30, (), lambda p: github_fetch_pulls(p, etag_cache=True)),
+    Scenario("validate_agent[cold]", "file", 5, ("yaml", "pydantic"), lambda p: validate_corpus(p, cold=True)),
+    Scenario("validate_agent[warm]", "file", 20, ("yaml", "pydantic"), lambda p: validate_corpus(p, cold=False)),
+    Scenario("nexus.verify_dns", "record", 30, ("requests",), nexus_verify_dns),
+]
+
+
+def calibrate(runs: int = 15) -> float:
+    """Fastest-of-``runs`` milliseconds for a fixed pure-Python workload, to compare machines."""
+    document = {"records": [{"id": i, "name": f"host{i}", "tags": ["a", "b", "c"]} for i in range(200)]}
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _ in range(50):
+            json.loads(json.dumps(document))
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples)
+
+
+def run_scenario(scenario: Scenario, profile: StubProfile, iterations: int, warmup: int) -> dict[str, Any]:
+    latencies = []
+    units = 0
+    failures = 0
+    with scenario.setup(profile) as op:
+        for _ in range(warmup):
+            op()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call_started = time.perf_counter()
+            count, ok = op()
+            latencies.append((time.perf_counter() - call_started) * 1000)
+            units += count
+            failures += 0 if ok else 1
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "unit": scenario.unit,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "throughput": round(units / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(failures / iterations, 4),
+    }
+
+
+def regressions(result: dict[str, Any], baseline: dict[str, Any], scale: float, tolerance: float) -> list[str]:
+    found = []
+    p50_limit = baseline["p50_ms"] * scale * (1 + tolerance)
+    if result["p50_ms"] > p50_limit:
+        found.append(f"p50 {result['p50_ms']:.1f}ms > {p50_limit:.1f}ms")
+    throughput_floor = baseline["throughput"] / scale / (1 + tolerance)
+    if result["throughput"] < throughput_floor:
+        found.append(f"throughput {result['throughput']:,.1f} < {throughput_floor:,.1f} {result['unit']}/s")
+    if result["error_rate"] > baseline["error_rate"] + ERROR_RATE_SLACK:
+        found.append(f"error rate {result['error_rate']:.1%} > {baseline['error_rate'] + ERROR_RATE_SLACK:.1%}")
+    return found
+
+
+def load_baselines(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baselines(path: Path, baselines: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", action="append", default=[], help="Run scenarios whose name starts with this")
+    parser.add_argument("--iterations", type=int, help="Override every scenario's iteration count")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, help="Added stub latency per request")
+    parser.add_argument("--jitter-ms", type=float, help="Uniform +/- jitter on the stub latency")
+    parser.add_argument("--error-rate", type=float, help="Fraction of stub requests that fail with 503")
+    parser.add_argument("--payload-bytes", type=int, help="Approximate reply/record payload size")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES_PATH))
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a regression against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    baselines_path = Path(args.baselines)
+    baselines = load_baselines(baselines_path)
+    # Runs default to the stored profile so numbers stay comparable with the baseline.
+    profile = StubProfile(**baselines.get("profile", {}))
+    overrides = {
+        "latency": args.latency_ms / 1000 if args.latency_ms is not None else None,
+        "jitter": args.jitter_ms / 1000 if args.jitter_ms is not None else None,
+        "error_rate": args.error_rate,
+        "payload_bytes": args.payload_bytes,
+        "seed": args.seed,
+    }
+    for key, value in overrides.items():
+        if value is not None:
+            setattr(profile, key, value)
+    if args.check and baselines and profile.as_dict() != baselines.get("profile"):
+        print("--check needs the baseline's stub profile; drop the profile overrides or --update-baseline.")
+        return 2
+
+    calibration_ms = calibrate()
+    # Only ever loosen the limits: a slower box gets proportional slack, a faster one is held to the baseline.
+    scale = max(1.0, calibration_ms / baselines["calibration_ms"]) if baselines.get("calibration_ms") else 1.0
+    print(f"profile: {json.dumps(profile.as_dict())}")
+    print(f"calibration: {calibration_ms:.2f}ms (x{scale:.2f} vs baseline)")
+    print(f"{'scenario':<24} {'p50':>9} {'p95':>9} {'p99':>9} {'throughput':>16} {'errors':>7}  vs baseline")
+
+    results: dict[str, dict[str, Any]] = {}
+    failed = []
+    for scenario in SCENARIOS:
+        if args.only and not any(scenario.name.startswith(prefix) for prefix in args.only):
+            continue
+        missing = [name for name in scenario.requires if importlib.util.find_spec(name) is None]
+        if missing:
+            print(f"{scenario.name:<24} skipped: {', '.join(missing)} not installed")
+            continue
+        result = run_scenario(scenario, profile, args.iterations or scenario.iterations, args.warmup)
+        results[scenario.name] = result
+        baseline = baselines.get("scenarios", {}).get(scenario.name)
+        if baseline is None:
+            verdict = "no baseline"
+        else:
+            found = regressions(result, baseline, scale, args.tolerance)
+            verdict = "REGRESSION: " + "; ".join(found) if found else f"ok (p50 {result['p50_ms'] / baseline['p50_ms']:.2f}x)"
+            if found:
+                failed.append(scenario.name)
+        throughput = f"{result['throughput']:,.1f} {result['unit']}/s"
+        print(
+            f"{scenario.name:<24} {result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms "
+            f"{throughput:>16} {result['error_rate']:>7.1%}  {verdict}"
+        )
+
+    report = {
+        "profile": profile.as_dict(),
+        "calibration_ms": round(calibration_ms, 3),
+        "python": platform.python_version(),
+        "scenarios": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        if baselines.get("profile") not in (None, report["profile"]):
+            # A new profile invalidates every stored scenario, not just the ones rerun.
+            baselines = {}
+        merged = {**baselines.get("scenarios", {}), **results}
+        save_baselines(baselines_path, {**report, "scenarios": merged})
+        print(f"baseline updated: {baselines_path.relative_to(ROOT)} ({len(results)} scenario(s))")
+
+    if failed:
+        print(f"regressions: {', '.join(failed)}")
+    return 1 if args.check and failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark the compiled triage rules against the original per-keyword scan."""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from triage_rules import DEFAULT_RULES_PATH, TriageRules
+
+# Snapshot of the hardcoded keyword sets used before the rules file existed.
+P0_KEYWORDS = {
+    "security", "cve", "vuln", "vulnerability", "hotfix", "outage", "incident",
+    "production down", "auth bypass", "rce", "secret leak", "critical",
+}
+P1_KEYWORDS = {
+    "release", "launch", "milestone", "go-live", "feature", "shipping", "beta",
+    "roadmap", "docs", "documentation", "ci", "workflow",
+}
+CLOSE_REASON_KEYWORDS = {"wip", "draft", "experiment", "spike", "duplicate"}
+WORDS = [
+    "fix", "update", "refactor", "add", "remove", "bump", "dependency", "ui", "api", "agent",
+    "chat", "router", "cache", "tests", "lint", "typo", "config", "deploy", "logging", "metrics",
+]
+KEYWORDS = sorted(P0_KEYWORDS | P1_KEYWORDS | CLOSE_REASON_KEYWORDS)
+LABELS = ["security", "sev0", "blocker", "release", "feature", "p1", "bug", "chore", "deps"]
+
+
+def legacy_score(pr: dict[str, Any], now: dt.datetime) -> tuple[str, str]:
+    title = (pr.get("title") or "").lower()
+    labels = {lbl["name"].lower() for lbl in pr.get("labels", [])}
+    if any(k in title for k in P0_KEYWORDS) or {"security", "sev0", "blocker"} & labels:
+        priority = "P0"
+    elif any(k in title for k in P1_KEYWORDS) or {"release", "feature", "p1"} & labels:
+        priority = "P1"
+    else:
+        priority = "P2"
+    age_days = (now - dt.datetime.fromisoformat(pr["created_at"].replace("Z", "+00:00"))).days
+    if pr.get("draft"):
+        return priority, "request changes"
+    if priority == "P0":
+        return priority, "merge"
+    if priority == "P1":
+        return priority, "request changes" if age_days > 30 else "merge"
+    if any(k in title for k in CLOSE_REASON_KEYWORDS) or age_days > 60:
+        return priority, "close"
+    return priority, "request changes"
+
+
+def synthetic_prs(count: int, now: dt.datetime, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    prs = []
+    for number in range(count):
+        words = rng.choices(WORDS, k=rng.randint(3, 9))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(KEYWORDS))
+        created = now - dt.timedelta(days=rng.randint(0, 120))
+        prs.append(
+            {
+                "number": number,
+                "title": " ".join(words).capitalize(),
+                "labels": [{"name": name} for name in rng.sample(LABELS, k=rng.randint(0, 2))],
+                "draft": rng.random() < 0.1,
+                "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        )
+    return prs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--rules", default=str(DEFAULT_RULES_PATH))
+    args = parser.parse_args()
+
+    now = dt.datetime.now(dt.timezone.utc)
+    prs = synthetic_prs(args.count, now)
+
+    started = time.perf_counter()
+    legacy = [legacy_score(pr, now) for pr in prs]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rules = TriageRules.load(args.rules)
+    compiled = rules.score_batch(prs, now)
+    compiled_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for old, new in zip(legacy, compiled) if old != new[:2])
+    print(f"records:   {len(prs)}")
+    print(f"legacy:    {legacy_seconds:.3f}s ({len(prs) / legacy_seconds:,.0f} PR/s)")
+    print(f"compiled:  {compiled_seconds:.3f}s ({len(prs) / compiled_seconds:,.0f} PR/s)")
+    print(f"speedup:   {legacy_seconds / compiled_seconds:.2f}x")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
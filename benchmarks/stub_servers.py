@@ -0,0 +1,308 @@
+"""Local HTTP stand-ins for the services the benchmarked code talks to.
+
+Each stub listens on 127.0.0.1 on a free port and answers with the same shapes as the real
+service: the LexBANK backend (``/api/control/run`` and ``/health``), the GitHub pulls
+listing and the Cloudflare ``dns_records`` listing plus batch endpoint. A ``StubProfile``
+sets added latency, jitter, injected error rate and payload size; randomness is seeded so
+runs are repeatable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+PULLS_RE = re.compile(r"^/repos/([^/]+/[^/]+)/pulls$")
+DNS_RECORDS_RE = re.compile(r"^/zones/([^/]+)/dns_records$")
+DNS_BATCH_RE = re.compile(r"^/zones/([^/]+)/dns_records/batch$")
+# Pull listings never change between requests, so one fixed validator date serves every page.
+PULLS_LAST_MODIFIED = "Tue, 14 Nov 2023 22:13:20 GMT"
+WORDS = ["agent", "report", "ledger", "policy", "review", "deploy", "audit", "router", "cache", "token"]
+
+
+@dataclass
+class StubProfile:
+    latency: float = 0.005
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    payload_bytes: int = 2048
+    seed: int = 7
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "payload_bytes": self.payload_bytes,
+            "seed": self.seed,
+        }
+
+
+@dataclass
+class StubState:
+    """Shared by all handler threads of one server: seeded RNG plus request counters."""
+
+    profile: StubProfile
+    pull_count: int = 250
+    dns_record_count: int = 250
+    domain: str = "corehub.nexus"
+    stats: dict[str, int] = field(default_factory=lambda: {"requests": 0, "errors": 0, "bytes": 0, "not_modified": 0})
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.profile.seed)
+
+    def draw(self) -> tuple[float, bool]:
+        """(delay, fail) for the next request."""
+        profile = self.profile
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = profile.latency + self._rng.uniform(-profile.jitter, profile.jitter)
+            fail = self._rng.random() < profile.error_rate
+            if fail:
+                self.stats["errors"] += 1
+        return max(0.0, delay), fail
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def sent(self, size: int) -> None:
+        with self._lock:
+            self.stats["bytes"] += size
+
+    def text(self, size: int, salt: int = 0) -> str:
+        """Deterministic filler text of about ``size`` characters."""
+        words = []
+        length = 0
+        index = salt
+        while length < size:
+            word = WORDS[index % len(WORDS)]
+            words.append(word)
+            length += len(word) + 1
+            index += 7
+        return " ".join(words)[:size]
+
+    def pull(self, number: int) -> dict[str, Any]:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1_700_000_000 - number * 3600))
+        return {
+            "number": number,
+            "title": f"{WORDS[number % len(WORDS)]}: update {WORDS[(number * 3) % len(WORDS)]} handling",
+            "state": "open",
+            "draft": number % 11 == 0,
+            "user": {"login": f"dev{number % 17}"},
+            "labels": [{"name": WORDS[number % len(WORDS)]}],
+            "created_at": stamp,
+            "updated_at": stamp,
+            "closed_at": None,
+            "body": self.text(self.profile.payload_bytes // 4, number),
+        }
+
+    def dns_record(self, index: int) -> dict[str, Any]:
+        return {
+            "id": f"rec{index:06d}",
+            "type": "A" if index % 3 else "CNAME",
+            "name": f"host{index}.{self.domain}",
+            "content": f"10.0.{index // 256 % 256}.{index % 256}" if index % 3 else f"target{index}.{self.domain}",
+            "ttl": 300,
+            "proxied": index % 2 == 0,
+            "comment": self.text(max(0, self.profile.payload_bytes // 16), index),
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY every response
+    # would wait on the client's delayed ACK and measure the kernel instead of the code.
+    disable_nagle_algorithm = True
+    server: "StubServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(
+        self, status: int, body: bytes, content_type: str = "application/json", headers: dict[str, str] | None = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.state.sent(len(body))
+
+    def _json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), headers=headers)
+
+    def _handle(self, method: str) -> None:
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        body = self._read_body() if method == "POST" else b""
+        delay, fail = self.server.state.draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._json(503, {"success": False, "errors": [{"code": 503, "message": "injected failure"}]})
+            return
+        route = self.server.route(method, parts.path)
+        if route is None:
+            self._json(404, {"message": "Not Found"})
+            return
+        route(self, query, body)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server; use as a context manager to serve in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, state: StubState) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.state = state
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method: str, path: str) -> Any:
+        raise NotImplementedError
+
+    def __enter__(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class LexbankStub(StubServer):
+    """``POST /api/control/run`` as JSON or an SSE stream of ``delta`` events, plus ``GET /health``."""
+
+    chunk_bytes = 64
+
+    def route(self, method: str, path: str) -> Any:
+        if method == "GET" and path == "/health":
+            return lambda handler, query, body: handler._json(200, {"status": "ok"})
+        if method == "POST" and path == "/api/control/run":
+            return self.run_agents
+        return None
+
+    def run_agents(self, handler: StubHandler, query: dict[str, str], body: bytes) -> None:
+        request = json.loads(body or b"{}")
+        reply = self.state.text(self.state.profile.payload_bytes, len(request.get("query", "")))
+        if not request.get("stream"):
+            handler._json(200, {"result": reply, "agents": request.get("agents", [])})
+            return
+        events = [
+            f"data: {json.dumps({'delta': reply[i : i + self.chunk_bytes]})}\n\n"
+            for i in range(0, len(reply), self.chunk_bytes)
+        ]
+        events.append("data: [DONE]\n\n")
+        handler._send(200, "".join(events).encode("utf-8"), content_type="text/event-stream; charset=utf-8")
+
+
+class GitHubStub(StubServer):
+    """``GET /repos/{owner}/{repo}/pulls`` with page/per_page and a Link header like the real API.
+
+    Pages carry ``ETag`` and ``Last-Modified``; a matching ``If-None-Match`` (or, without one,
+    ``If-Modified-Since``) gets an empty 304 Not Modified.
+    """
+
+    def route(self, method: str, path: str) -> Any:
+        if method == "GET" and PULLS_RE.match(path):
+            return self.pulls
+        return None
+
+    def pulls(self, handler: StubHandler, query: dict[str, str], body: bytes) -> None:
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        total = self.state.pull_count
+        last_page = max(1, -(-total // per_page))
+        start = (page - 1) * per_page
+        items = [self.state.pull(total - n) for n in range(start, min(start + per_page, total))]
+        base = f"{self.url}{urlsplit(handler.path).path}"
+        params = {key: value for key, value in query.items() if key != "page"}
+        encoded = "&".join(f"{key}={value}" for key, value in params.items())
+        links = []
+        if page < last_page:
+            links.append(f'<{base}?{encoded}&page={page + 1}>; rel="next"')
+        links.append(f'<{base}?{encoded}&page={last_page}>; rel="last"')
+        payload = json.dumps(items).encode("utf-8")
+        validators = {"ETag": f'"{hashlib.sha1(payload).hexdigest()[:20]}"', "Last-Modified": PULLS_LAST_MODIFIED}
+        headers = {"Link": ", ".join(links), **validators}
+        if_none_match = handler.headers.get("If-None-Match")
+        if (if_none_match == validators["ETag"]) if if_none_match else (
+            handler.headers.get("If-Modified-Since") == PULLS_LAST_MODIFIED
+        ):
+            self.state.count("not_modified")
+            handler._send(304, b"", headers=headers)
+            return
+        handler._send(200, payload, headers=headers)
+
+
+class CloudflareStub(StubServer):
+    """Zone ``dns_records`` listing (``result_info.total_pages``) and the ``dns_records/batch`` write."""
+
+    def route(self, method: str, path: str) -> Any:
+        if method == "GET" and DNS_RECORDS_RE.match(path):
+            return self.dns_records
+        if method == "POST" and DNS_BATCH_RE.match(path):
+            return self.batch
+        return None
+
+    def dns_records(self, handler: StubHandler, query: dict[str, str], body: bytes) -> None:
+        per_page = int(query.get("per_page", 100))
+        page = int(query.get("page", 1))
+        total = self.state.dns_record_count
+        start = (page - 1) * per_page
+        result = [self.state.dns_record(i) for i in range(start, min(start + per_page, total))]
+        handler._json(
+            200,
+            {
+                "success": True,
+                "errors": [],
+                "result": result,
+                "result_info": {
+                    "page": page,
+                    "per_page": per_page,
+                    "count": len(result),
+                    "total_count": total,
+                    "total_pages": max(1, -(-total // per_page)),
+                },
+            },
+        )
+
+    def batch(self, handler: StubHandler, query: dict[str, str], body: bytes) -> None:
+        request = json.loads(body or b"{}")
+        handler._json(
+            200,
+            {
+                "success": True,
+                "errors": [],
+                "result": {name: request.get(name, []) for name in ("deletes", "patches", "puts", "posts")},
+            },
+        )
@@ -0,0 +1,37 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+
+@dataclass
+class BatchResult:
+    index: int
+    result: Optional[Any] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_batch(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Sequence[Any],
+    concurrency: int = 4,
+) -> List[BatchResult]:
+    """Run ``func`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    Results keep input order; a failing item records its error instead of aborting the batch.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, item: Any) -> BatchResult:
+        async with semaphore:
+            try:
+                return BatchResult(index, result=await func(item))
+            except Exception as exc:
+                return BatchResult(index, error=exc)
+
+    return list(await asyncio.gather(*(run_one(i, item) for i, item in enumerate(items))))
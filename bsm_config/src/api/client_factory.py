@@ -1,5 +1,12 @@
+import asyncio
+import threading
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .batch import BatchResult, run_batch
+from .client_pool import ProviderClientPool
+from .fake_provider import FakeProviderClient
+from .response_cache import ResponseCache, cache_key
 
 
 @dataclass
@@ -24,16 +31,117 @@ class MockProviderClient:
         }
 
 
+PROVIDER_MAP: Dict[str, Callable[[str], Any]] = {
+    name: MockProviderClient
+    for name in ("openai", "anthropic", "gemini", "azure", "groq", "cohere", "mistral", "perplexity")
+}
+PROVIDER_MAP["fake"] = FakeProviderClient
+
+
+_CACHE_FROM_ENV: Any = object()
+T = TypeVar("T")
+
+
+class RoutedClient:
+    """Async client that routes each call through the factory's provider pool.
+
+    Responses are served from ``cache`` when any enabled provider already answered the same
+    params; pass ``{"cache": False}`` in the params (or ``useCache=False``) to bypass it.
+    """
+
+    def __init__(self, pool: ProviderClientPool, cache: Optional[ResponseCache] = None) -> None:
+        self.pool = pool
+        self.cache = cache
+
+    async def generateReport(self, params: Dict[str, Any], useCache: bool = True) -> Dict[str, Any]:
+        return await self._cached_call("generateReport", params, useCache and params.get("cache", True) is not False)
+
+    async def analyzeData(self, data: Any, useCache: bool = True) -> Dict[str, Any]:
+        return await self._cached_call("analyzeData", data, useCache)
+
+    async def _cached_call(self, method: str, payload: Any, useCache: bool) -> Dict[str, Any]:
+        if self.cache is None or not useCache:
+            return await self.pool.call(method, payload)
+        for name in self.pool.ranked():
+            cached = self.cache.get(cache_key(name, method, payload))
+            if cached is not None:
+                return cached
+        result = await self.pool.call(method, payload)
+        provider = result.get("provider") if isinstance(result, dict) else None
+        if provider in self.pool.clients:
+            self.cache.put(cache_key(provider, method, payload), result)
+        return result
+
+    async def generateReportBatch(self, paramsList: List[Dict[str, Any]], concurrency: int = 4) -> List[BatchResult]:
+        return await run_batch(self.generateReport, paramsList, concurrency)
+
+    async def analyzeDataBatch(self, dataList: List[Any], concurrency: int = 4) -> List[BatchResult]:
+        return await run_batch(self.analyzeData, dataList, concurrency)
+
+
 class APIClientFactory:
     @staticmethod
-    def fromProviders(enabledProviders: List[str]) -> "APIClientFactory":
+    def fromProviders(enabledProviders: List[str], **pool_options: Any) -> "APIClientFactory":
         providers = [p.strip() for p in enabledProviders if p and p.strip()]
         if not providers:
             providers = ["openai"]
-        return APIClientFactory(providers)
+        return APIClientFactory(providers, **pool_options)
 
-    def __init__(self, providers: List[str]) -> None:
+    def __init__(
+        self,
+        providers: List[str],
+        clients: Optional[Dict[str, Any]] = None,
+        max_connections: int = 8,
+        hedge_delay: Optional[float] = None,
+        cache: Optional[ResponseCache] = _CACHE_FROM_ENV,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
         self.providers = providers
+        self.cache = ResponseCache.fromEnv() if cache is _CACHE_FROM_ENV else cache
+        if clients is None:
+            clients = {name: PROVIDER_MAP.get(name, MockProviderClient)(name) for name in providers}
+        self.pool = ProviderClientPool(
+            clients,
+            max_connections=max_connections,
+            hedge_delay=hedge_delay,
+            rate_limits=rate_limits,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    def getPrimaryClient(self) -> Any:
+        """Return the currently fastest healthy provider client."""
+        return self.pool.clients[self.pool.ranked()[0]]
+
+    def getAllClients(self) -> List[Any]:
+        return list(self.pool.clients.values())
+
+    def getRoutedClient(self) -> RoutedClient:
+        return RoutedClient(self.pool, self.cache)
+
+    def runSync(self, coro: Awaitable[T]) -> T:
+        """Run ``coro`` on this factory's background event loop and block until it finishes.
+
+        The pool's limiters wait on asyncio conditions bound to one loop, so every blocking
+        entry point, from any thread sharing the factory, is submitted to the same loop.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="api-client-factory", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def generateReport(self, params: Dict[str, Any], useCache: bool = True) -> Dict[str, Any]:
+        """Blocking, cached report generation for scripts that do not run an event loop."""
+        return self.runSync(self.getRoutedClient().generateReport(params, useCache))
+
+    def generateReportBatch(self, paramsList: List[Dict[str, Any]], concurrency: int = 4) -> List[BatchResult]:
+        """Blocking batch entry point for scripts that do not run an event loop."""
+        return self.runSync(self.getRoutedClient().generateReportBatch(paramsList, concurrency))
+
+    def analyzeDataBatch(self, dataList: List[Any], concurrency: int = 4) -> List[BatchResult]:
+        """Blocking batch entry point for scripts that do not run an event loop."""
+        return self.runSync(self.getRoutedClient().analyzeDataBatch(dataList, concurrency))
 
-    def getPrimaryClient(self) -> MockProviderClient:
-        return MockProviderClient(self.providers[0])
+    def getStats(self) -> Dict[str, Dict[str, Any]]:
+        return self.pool.snapshot()
@@ -0,0 +1,210 @@
+import asyncio
+import inspect
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .rate_limit import ProviderLimiter, estimate_tokens, is_throttle
+
+# Providers with fewer latency samples than this are ranked no faster than the pool median.
+MIN_RANK_SAMPLES = 3
+# The error rate only marks a provider unhealthy once the window holds this many outcomes.
+MIN_HEALTH_SAMPLES = 5
+
+
+class ProviderPoolError(RuntimeError):
+    """Raised when every provider in the pool failed a call."""
+
+    def __init__(self, method: str, errors: Dict[str, BaseException]) -> None:
+        detail = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        super().__init__(f"All providers failed {method}: {detail}")
+        self.errors = errors
+
+
+class ProviderStats:
+    """Rolling latency and error-rate window for one provider.
+
+    Three consecutive failures, or an error rate above ``max_error_rate`` over at least
+    ``MIN_HEALTH_SAMPLES`` outcomes, trip a ``cooldown``. Once it passes the provider is
+    half-open: routed to again, cleared on its next success and re-tripped on its next failure.
+    """
+
+    def __init__(self, window: int = 100, cooldown: float = 30.0, max_error_rate: float = 0.5) -> None:
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.cooldown = cooldown
+        self.max_error_rate = max_error_rate
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.half_open = False
+        self.inflight = 0
+        self.losses = 0
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        if self.half_open:
+            # Recovered: forget the failures that tripped the breaker.
+            self.outcomes.clear()
+            self.half_open = False
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+
+    def record_loss(self, elapsed: float) -> None:
+        """A call cancelled before it finished (e.g. it lost a hedge): ``elapsed`` is a lower bound."""
+        self.latencies.append(elapsed)
+        self.losses += 1
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        over_rate = len(self.outcomes) >= MIN_HEALTH_SAMPLES and self.error_rate > self.max_error_rate
+        if self.half_open or self.consecutive_failures >= 3 or over_rate:
+            self.unhealthy_until = time.monotonic() + self.cooldown
+            self.half_open = True
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "p50": round(self.percentile(50), 4),
+            "p95": round(self.percentile(95), 4),
+            "error_rate": round(self.error_rate, 3),
+            "samples": len(self.outcomes),
+            "losses": self.losses,
+            "healthy": self.healthy,
+            "inflight": self.inflight,
+        }
+
+
+class ProviderClientPool:
+    """Routes calls across provider clients by health and rolling p50 latency.
+
+    Each provider gets a ``ProviderLimiter``: optional requests/tokens-per-minute budgets
+    (``rate_limits[name]``) and an AIMD concurrency limit capped at ``max_connections`` that
+    backs off on 429/5xx. Failed calls fall back to the next-ranked provider; with
+    ``hedge_delay`` set, a second provider is raced against the first once the delay elapses.
+    """
+
+    def __init__(
+        self,
+        clients: Dict[str, Any],
+        max_connections: int = 8,
+        hedge_delay: Optional[float] = None,
+        window: int = 100,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        self.clients = clients
+        self.hedge_delay = hedge_delay
+        self.stats = {name: ProviderStats(window) for name in clients}
+        rate_limits = rate_limits or {}
+        self.limiters = {
+            name: ProviderLimiter(max_connections, **rate_limits.get(name, {})) for name in clients
+        }
+
+    def ranked(self) -> List[str]:
+        """Healthy providers first, fastest p50 first.
+
+        Providers with fewer than ``MIN_RANK_SAMPLES`` latencies rank at the median p50 of the
+        sampled ones (or their own p50 if higher), after any sampled provider at that latency.
+        """
+        sampled = sorted(
+            stats.percentile(50) for stats in self.stats.values() if len(stats.latencies) >= MIN_RANK_SAMPLES
+        )
+        median = sampled[len(sampled) // 2] if sampled else 0.0
+
+        def key(name: str) -> tuple:
+            stats = self.stats[name]
+            few = len(stats.latencies) < MIN_RANK_SAMPLES
+            p50 = max(stats.percentile(50), median) if few else stats.percentile(50)
+            return (not stats.healthy, p50, few)
+
+        return sorted(self.clients, key=key)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {**stats.snapshot(), **self.limiters[name].snapshot()} for name, stats in self.stats.items()
+        }
+
+    async def call(self, method: str, *args: Any) -> Any:
+        order = self.ranked()
+        errors: Dict[str, BaseException] = {}
+        index = 0
+        while index < len(order):
+            primary = order[index]
+            secondary = order[index + 1] if self.hedge_delay is not None and index + 1 < len(order) else None
+            try:
+                if secondary is None:
+                    return await self._invoke(primary, method, args)
+                return await self._hedged(primary, secondary, method, args)
+            except Exception as exc:
+                errors[primary if secondary is None else f"{primary}|{secondary}"] = exc
+            index += 1 if secondary is None else 2
+        raise ProviderPoolError(method, errors)
+
+    async def invoke(self, name: str, method: str, *args: Any) -> Any:
+        """Call one specific provider with no ranking or fallback; stats and limits still apply."""
+        return await self._invoke(name, method, args)
+
+    async def _invoke(self, name: str, method: str, args: tuple) -> Any:
+        stats = self.stats[name]
+        limiter = self.limiters[name]
+        await limiter.acquire(estimate_tokens(args))
+        stats.inflight += 1
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            func = getattr(self.clients[name], method)
+            if inspect.iscoroutinefunction(func):
+                result = await func(*args)
+            else:
+                result = await asyncio.to_thread(func, *args)
+        except asyncio.CancelledError:
+            # Hedge losers are cancelled; without a sample a slow provider would keep ranking first.
+            stats.record_loss(time.perf_counter() - started)
+            raise
+        except Exception as exc:
+            outcome = "throttled" if is_throttle(exc) else "error"
+            stats.record_failure()
+            raise
+        else:
+            outcome = "success"
+            stats.record_success(time.perf_counter() - started)
+            return result
+        finally:
+            stats.inflight -= 1
+            await limiter.release(outcome)
+
+    async def _hedged(self, primary: str, secondary: str, method: str, args: tuple) -> Any:
+        first = asyncio.ensure_future(self._invoke(primary, method, args))
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_delay)
+        if done:
+            if first.exception() is None:
+                return first.result()
+            pending = {asyncio.ensure_future(self._invoke(secondary, method, args))}
+        else:
+            pending = {first, asyncio.ensure_future(self._invoke(secondary, method, args))}
+
+        error: Optional[BaseException] = first.exception() if done else None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error
@@ -0,0 +1,64 @@
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+class ProviderError(RuntimeError):
+    """Raised by provider clients when a call fails."""
+
+    def __init__(self, provider: str, message: str, status: Optional[int] = None) -> None:
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.status = status
+
+
+@dataclass
+class FakeProviderClient:
+    """Offline provider with configurable latency and failure rate, for tests and benchmarks.
+
+    With ``throttle_concurrency`` set, calls beyond that many in flight fail with a 429.
+    """
+
+    name: str
+    latency: float = 0.01
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+    throttle_concurrency: Optional[int] = None
+    calls: int = 0
+    throttled: int = 0
+    inflight: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    async def _simulate(self) -> None:
+        self.calls += 1
+        if self.throttle_concurrency is not None and self.inflight >= self.throttle_concurrency:
+            self.throttled += 1
+            raise ProviderError(self.name, "rate limited", status=429)
+        self.inflight += 1
+        try:
+            await asyncio.sleep(max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter)))
+        finally:
+            self.inflight -= 1
+        if self._rng.random() < self.error_rate:
+            raise ProviderError(self.name, "injected failure", status=500)
+
+    async def generateReport(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        await self._simulate()
+        return {
+            "content": f"# {params.get('title', 'Report')}\n\nProvider: {self.name}\n",
+            "provider": self.name,
+            "model": params.get("model"),
+        }
+
+    async def analyzeData(self, data: Any) -> Dict[str, Any]:
+        await self._simulate()
+        return {
+            "provider": self.name,
+            "recommendations": [f"Use {self.name} for deeper trend detection."],
+            "raw": data,
+        }
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from .client_pool import ProviderClientPool
+
+
+@dataclass
+class BenchmarkSample:
+    provider: str
+    latency: float
+    ok: bool
+    error: Optional[str] = None
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples: List[BenchmarkSample]) -> Dict[str, Dict[str, Any]]:
+    """Per-provider latency percentiles (successful calls), throughput and error rate.
+
+    All samples of a round start together, so a provider's throughput is its successful
+    calls divided by its slowest call.
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    for provider in sorted({sample.provider for sample in samples}):
+        mine = [sample for sample in samples if sample.provider == provider]
+        latencies = sorted(sample.latency for sample in mine if sample.ok)
+        errors = [sample.error for sample in mine if not sample.ok]
+        elapsed = max(sample.latency for sample in mine)
+        summary[provider] = {
+            "requests": len(mine),
+            "p50": round(_percentile(latencies, 50), 4),
+            "p95": round(_percentile(latencies, 95), 4),
+            "p99": round(_percentile(latencies, 99), 4),
+            "throughput": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+            "error_rate": round(len(errors) / len(mine), 3),
+            "last_error": errors[-1] if errors else None,
+        }
+    return summary
+
+
+async def benchmark_round(
+    pool: ProviderClientPool,
+    payload: Any,
+    requests_per_provider: int = 1,
+    method: str = "generateReport",
+) -> Dict[str, Any]:
+    """Fire ``requests_per_provider`` identical calls at every provider in the pool at once.
+
+    Calls go through ``pool.invoke`` so each provider's limiter applies and the results feed
+    the pool's routing stats, but nothing is cached or retried on another provider.
+    """
+
+    async def timed(name: str) -> BenchmarkSample:
+        started = time.perf_counter()
+        try:
+            await pool.invoke(name, method, payload)
+        except Exception as exc:
+            return BenchmarkSample(name, time.perf_counter() - started, False, f"{type(exc).__name__}: {exc}")
+        return BenchmarkSample(name, time.perf_counter() - started, True)
+
+    started = time.perf_counter()
+    samples = await asyncio.gather(*(timed(name) for name in pool.clients for _ in range(requests_per_provider)))
+    elapsed = time.perf_counter() - started
+    return {"timestamp": time.time(), "elapsed": round(elapsed, 4), "providers": summarize(list(samples))}
+
+
+@dataclass
+class BenchmarkHistory:
+    """Bounded list of benchmark rounds, oldest first, for plotting metrics over time."""
+
+    max_rounds: int = 200
+    rounds: Deque[Dict[str, Any]] = field(default_factory=deque)
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.rounds.append(result)
+        while len(self.rounds) > self.max_rounds:
+            self.rounds.popleft()
+
+    def series(self, metric: str) -> Dict[str, List[float]]:
+        """``metric`` per provider across retained rounds (None where a provider was absent)."""
+        providers = sorted({name for result in self.rounds for name in result["providers"]})
+        return {
+            name: [result["providers"].get(name, {}).get(metric) for result in self.rounds] for name in providers
+        }
+
+    def clear(self) -> None:
+        self.rounds.clear()
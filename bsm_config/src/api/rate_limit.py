@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+THROTTLE_STATUSES = {429}
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """True for provider errors that signal overload (429 or any 5xx)."""
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status in THROTTLE_STATUSES or status >= 500)
+
+
+def estimate_tokens(payload: Any) -> int:
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``per_minute`` with a burst of ``capacity``.
+
+    ``reserve`` always succeeds and lets the balance go negative; the caller sleeps for the
+    returned delay, which keeps reservations FIFO without a lock.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: +1 per limit's worth of successes, halved on throttling.
+
+    State sits behind a thread lock and each waiter parks on a future of its own loop, so one
+    limiter can be shared by callers on different event loops (e.g. separate ``asyncio.run``
+    calls in several threads). A released slot is handed straight to the oldest waiter.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, initial: Optional[int] = None, decrease: float = 0.5) -> None:
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(initial or maximum)
+        self.decrease = decrease
+        self.inflight = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self.inflight < int(self.limit):
+                self.inflight += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over just as we were cancelled; pass it on.
+            self._release_slot()
+            raise
+
+    async def release(self, outcome: str) -> None:
+        with self._lock:
+            if outcome == "success":
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            elif outcome == "throttled":
+                self.limit = max(self.minimum, self.limit * self.decrease)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self.inflight -= 1
+            while self._waiters and self.inflight < int(self.limit):
+                loop, future = self._waiters.popleft()
+                self.inflight += 1
+                loop.call_soon_threadsafe(_grant, future)
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ProviderLimiter:
+    """Per-provider request/token budgets plus adaptive concurrency, with queueing metrics."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.queue_depth = 0
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, tokens: int = 1) -> None:
+        started = time.monotonic()
+        self.queue_depth += 1
+        try:
+            delay = max(
+                self.requests.reserve(1) if self.requests else 0.0,
+                self.tokens.reserve(tokens) if self.tokens else 0.0,
+            )
+            if delay:
+                await asyncio.sleep(delay)
+            await self.concurrency.acquire()
+        finally:
+            self.queue_depth -= 1
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    async def release(self, outcome: str) -> None:
+        if outcome == "throttled":
+            self.throttled += 1
+        await self.concurrency.release(outcome)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "queue_depth": self.queue_depth,
+            "throttled": self.throttled,
+            "avg_wait": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "max_wait": round(self.max_wait, 4),
+        }
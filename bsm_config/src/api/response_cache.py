@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = ".cache/bsm-ai/responses.sqlite"
+# Per-call flags that control caching but must not change the cache key.
+NON_KEY_PARAMS = {"cache"}
+
+
+def cache_key(provider: str, method: str, payload: Any) -> str:
+    """Stable content hash of (provider, method, model, normalized params)."""
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in NON_KEY_PARAMS}
+    canonical = json.dumps(
+        {"provider": provider, "method": method, "payload": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache for provider responses.
+
+    Entries older than ``max_age_seconds`` are ignored and pruned; each tier is capped by
+    entry count, evicting least recently used entries first.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 5000,
+        max_age_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age_seconds = max_age_seconds
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, created REAL NOT NULL, accessed REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._db.commit()
+            self.prune()
+
+    @classmethod
+    def fromEnv(cls) -> Optional["ResponseCache"]:
+        """Build the cache from AI_CACHE / AI_CACHE_PATH / AI_CACHE_MAX_AGE_SECONDS; ``AI_CACHE=off`` disables it."""
+        if os.getenv("AI_CACHE", "on").lower() in {"off", "0", "false"}:
+            return None
+        return cls(
+            path=os.getenv("AI_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+            max_age_seconds=float(os.getenv("AI_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600))),
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self.max_age_seconds:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry[1]
+            if entry:
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created, value FROM responses WHERE key = ? AND created >= ?",
+                    (key, now - self.max_age_seconds),
+                ).fetchone()
+                if row:
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.hits["disk"] += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, created, accessed, value) VALUES (?, ?, ?, ?)",
+                    (key, now, now, json.dumps(value, ensure_ascii=False, default=str)),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def prune(self) -> None:
+        """Drop expired disk entries and enforce the disk size cap."""
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.max_age_seconds,))
+            self._evict_disk()
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] if self._db else 0
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, created: float, value: Any) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
@@ -1,5 +1,6 @@
+import asyncio
 import os
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, List
 
 from .engine import BSM_AgentEngine
 from bsm_config.src.api.client_factory import APIClientFactory
@@ -12,8 +13,12 @@ class BSM_AI_Engine(BSM_AgentEngine):
 
     def _init_ai_client(self):
         enabled_providers = [p.strip() for p in os.environ.get("ENABLED_PROVIDERS", "").split(",") if p.strip()]
-        factory = APIClientFactory.fromProviders(enabled_providers)
-        return factory.getPrimaryClient()
+        hedge_delay = os.environ.get("AI_HEDGE_DELAY_SECONDS")
+        self.ai_factory = APIClientFactory.fromProviders(
+            enabled_providers,
+            hedge_delay=float(hedge_delay) if hedge_delay else None,
+        )
+        return self.ai_factory.getRoutedClient()
 
     async def execute_agent_with_ai_insight(self, name: str, context: Dict[str, Any]):
         result = await self.execute_agent(name, context)
@@ -24,3 +29,36 @@ class BSM_AI_Engine(BSM_AgentEngine):
             "ai_insights": ai_analysis,
             "recommendations": ai_analysis.get("recommendations", []),
         }
+
+    async def execute_agents_with_ai_insight(
+        self, names: List[str], context: Dict[str, Any], concurrency: int = 4
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run agents concurrently and yield each insight as soon as it is ready.
+
+        At most ``concurrency`` agents execute at once; each agent's result goes to AI
+        analysis as soon as it finishes, outside the agent slot. Failures are yielded as
+        ``{"agent": name, "error": ...}`` instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(name: str) -> Dict[str, Any]:
+            try:
+                async with semaphore:
+                    result = await self.execute_agent(name, context)
+                ai_analysis = await self.ai_client.analyzeData(result)
+            except Exception as exc:
+                return {"agent": name, "error": str(exc)}
+            return {
+                "agent": name,
+                "agent_result": result,
+                "ai_insights": ai_analysis,
+                "recommendations": ai_analysis.get("recommendations", []),
+            }
+
+        tasks = [asyncio.ensure_future(run_one(name)) for name in names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,73 @@
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
+
+import yaml
+
+AgentHandler = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+def load_env_file(path: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines; values already set in the environment win."""
+    values: Dict[str, str] = {}
+    env_path = Path(path)
+    if not env_path.is_file():
+        return values
+    for line in env_path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        values[key.strip()] = value.strip().strip("'\"")
+    for key, value in values.items():
+        if value:
+            os.environ.setdefault(key, value)
+    return values
+
+
+class BSM_AgentEngine:
+    """Loads agent definitions from data/agents and executes them through registered handlers."""
+
+    def __init__(self, config_path: str = "bsm-config/.env", agents_dir: str = "data/agents"):
+        self.config = load_env_file(config_path)
+        self.agents = self._load_agents(Path(agents_dir))
+        self.handlers: Dict[str, AgentHandler] = {}
+
+    @staticmethod
+    def _load_agents(agents_dir: Path) -> Dict[str, Dict[str, Any]]:
+        agents: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(agents_dir.glob("*.yaml")):
+            with path.open("r", encoding="utf-8") as handle:
+                spec = yaml.safe_load(handle) or {}
+            if isinstance(spec, dict) and spec.get("id"):
+                agents[spec["id"]] = spec
+        return agents
+
+    def register_handler(self, name: str, handler: AgentHandler) -> None:
+        self.handlers[name] = handler
+
+    async def execute_agent(self, name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        agent = self.agents.get(name)
+        if agent is None:
+            raise ValueError(f"Unknown agent: {name}")
+
+        handler = self.handlers.get(name, self._describe_agent)
+        started = time.perf_counter()
+        output = await handler(agent, context)
+        return {
+            "agent": name,
+            "status": "completed",
+            "output": output,
+            "duration": round(time.perf_counter() - started, 4),
+        }
+
+    @staticmethod
+    async def _describe_agent(agent: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        # Without a registered handler the engine reports the agent's configured plan.
+        return {
+            "role": agent.get("role"),
+            "model": agent.get("modelName"),
+            "actions": agent.get("actions", []),
+            "context_keys": sorted(context),
+        }
@@ -1,8 +1,11 @@
+import pandas as pd
 import streamlit as st
 
 from bsm_config.src.api.client_factory import APIClientFactory
+from bsm_config.src.api.provider_benchmark import BenchmarkHistory, benchmark_round
 
 
+@st.cache_resource
 def getEnabledProviders():
     import os
     return [
@@ -19,17 +22,32 @@ def getEnabledProviders():
     ]
 
 
+# Process-level resources: built once and shared across reruns and sessions. Sessions run in
+# their own threads, so pool work goes through factory.runSync (one background event loop)
+# rather than asyncio.run, which would bind the shared limiters to each session's loop.
+@st.cache_resource
+def getFactory():
+    return APIClientFactory.fromProviders(getEnabledProviders())
+
+
+@st.cache_resource
+def getBenchmarkHistory():
+    return BenchmarkHistory()
+
+
+def metricFrame(history, metric):
+    return pd.DataFrame(history.series(metric))
+
+
 st.title("🧠 BSM-AgentOS — AI-Powered Agent Dashboard")
 
 enabled = getEnabledProviders()
+factory = getFactory()
 st.subheader("📡 Active AI Providers:")
 st.write(", ".join(enabled) if enabled else "No providers configured")
 
 if st.button("🧪 Test AI Report Generation"):
-    factory = APIClientFactory.fromProviders(enabled)
-    client = factory.getPrimaryClient()
-
-    result = client.generateReport({
+    result = factory.generateReport({
         "title": "Test Report",
         "data": {"sample": "data"},
         "format": "markdown"
@@ -37,3 +55,49 @@ if st.button("🧪 Test AI Report Generation"):
 
     st.success("✅ Report Generated!")
     st.markdown(result["content"])
+
+st.subheader("⏱️ Provider Benchmark")
+history = getBenchmarkHistory()
+rounds = st.slider("Rounds", 1, 50, 5)
+perProvider = st.slider("Concurrent requests per provider per round", 1, 20, 4)
+runCol, clearCol = st.columns(2)
+run = runCol.button("▶️ Run benchmark")
+if clearCol.button("🧹 Clear history"):
+    history.clear()
+
+summaryView = st.empty()
+chartsView = st.container()
+with chartsView:
+    st.caption("p50 / p95 latency (s) per round")
+    p50Chart = st.empty()
+    p95Chart = st.empty()
+    st.caption("Throughput (successful requests/s) per round")
+    throughputChart = st.empty()
+    st.caption("Error rate per round")
+    errorChart = st.empty()
+
+
+def renderBenchmark():
+    if not history.rounds:
+        summaryView.info("No benchmark rounds yet.")
+        return
+    latest = history.rounds[-1]["providers"]
+    summaryView.dataframe(pd.DataFrame(latest).T, use_container_width=True)
+    p50Chart.line_chart(metricFrame(history, "p50"))
+    p95Chart.line_chart(metricFrame(history, "p95"))
+    throughputChart.line_chart(metricFrame(history, "throughput"))
+    errorChart.line_chart(metricFrame(history, "error_rate"))
+
+
+if run:
+    params = {"title": "Benchmark Report", "data": {"sample": "data"}, "format": "markdown"}
+    progress = st.progress(0.0)
+    for index in range(rounds):
+        history.add(factory.runSync(benchmark_round(factory.pool, params, perProvider)))
+        renderBenchmark()
+        progress.progress((index + 1) / rounds)
+else:
+    renderBenchmark()
+
+with st.expander("Routing stats (rolling window)"):
+    st.dataframe(pd.DataFrame(factory.getStats()).T, use_container_width=True)
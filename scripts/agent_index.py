@@ -0,0 +1,221 @@
+"""Persistent, incrementally updated index of *.agent.md files shared by the agent tooling."""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+from front_matter import extract_front_matter, split_header
+from prompt_profile import count_tokens, minhash, shingles, tokenizer_name
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_INDEX_PATH = ROOT / ".cache" / "agent-index.json"
+DEFAULT_GLOBS = ("agents/*.agent.md", ".github/agents/*.agent.md")
+INDEX_VERSION = 4
+HEADING_RE = re.compile(r"^#{1,6}\s+(.*?)\s*#*\s*$")
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+MIN_BLOCK_TOKENS = 20
+
+
+def find_agent_files(globs: Iterable[str] = DEFAULT_GLOBS) -> list[Path]:
+    """Resolve ``globs`` (relative to the working directory) to existing files, in glob order."""
+    seen: dict[Path, None] = {}
+    for pattern in globs:
+        for match in glob.glob(pattern):
+            path = Path(match).resolve()
+            if path.is_file():
+                seen.setdefault(path)
+    return list(seen)
+
+
+def split_sections(text: str) -> list[tuple[str, str]]:
+    """Split into (heading, text) markdown sections; front matter and preamble included."""
+    sections: list[tuple[str, str]] = []
+    lines = text.splitlines(keepends=True)
+    header = split_header(text)
+    if header is not None:
+        # Opening delimiter, header lines, closing delimiter.
+        header_lines = len(header.splitlines()) + 2
+        sections.append(("(front matter)", "".join(lines[:header_lines])))
+        lines = lines[header_lines:]
+    heading, current = "(preamble)", []
+    in_fence = False
+    for line in lines:
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            if current or heading != "(preamble)":
+                sections.append((heading, "".join(current)))
+            heading, current = match.group(1), []
+        current.append(line)
+    if current or heading != "(preamble)":
+        sections.append((heading, "".join(current)))
+    return sections
+
+
+def prompt_blocks(sections: list[tuple[str, str]]) -> list[dict[str, Any]]:
+    """Paragraph-level blocks worth checking for cross-file boilerplate, with MinHash signatures."""
+    blocks = []
+    for heading, body in sections:
+        if heading == "(front matter)":
+            continue
+        for paragraph in PARAGRAPH_RE.split(body):
+            paragraph = paragraph.strip()
+            tokens = count_tokens(paragraph) if paragraph else 0
+            if tokens < MIN_BLOCK_TOKENS:
+                continue
+            blocks.append(
+                {
+                    "section": heading,
+                    "tokens": tokens,
+                    "preview": " ".join(paragraph.split())[:80],
+                    "signature": minhash(shingles(paragraph)),
+                }
+            )
+    return blocks
+
+
+def _jsonable(value: Any) -> Any:
+    """Nearest JSON value: dates and other YAML-only scalars become strings, keys become str."""
+    if isinstance(value, dict):
+        return {key if isinstance(key, str) else str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(item) for item in value]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def native_front_matter(entry: dict[str, Any]) -> Any:
+    """The front matter exactly as YAML parsed it, re-read from disk when JSON could not hold it."""
+    if entry.get("front_matter_exact", True):
+        return entry["front_matter"]
+    return extract_front_matter(ROOT / entry["path"])
+
+
+def _key(path: Path) -> str:
+    return str(path.relative_to(ROOT)) if path.is_relative_to(ROOT) else str(path)
+
+
+def _file_sha256(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def build_entry(path: Path, sha256: str, stat: Any) -> dict[str, Any]:
+    """Index entry from the front matter alone; the body is left to ``build_profile``."""
+    import yaml
+
+    entry: dict[str, Any] = {
+        "path": _key(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": sha256,
+        "front_matter": None,
+        "front_matter_exact": True,
+        "error": None,
+        "profile": None,
+    }
+    try:
+        # Header-only read, memoized per (path, mtime, size).
+        parsed = extract_front_matter(path)
+        # Stored as JSON so fresh and reloaded entries are identical. When that changes the value
+        # (e.g. a date), validation re-reads the native value instead of the stringified copy.
+        entry["front_matter"] = _jsonable(parsed)
+        entry["front_matter_exact"] = entry["front_matter"] == parsed
+    except (ValueError, yaml.YAMLError) as exc:
+        entry["error"] = str(exc)
+    return entry
+
+
+def build_profile(path: Path) -> dict[str, Any]:
+    """Size, token and section statistics plus MinHash-signed blocks for the whole file."""
+    profile: dict[str, Any] = {"chars": 0, "tokens": 0, "todo_count": 0, "sections": [], "blocks": []}
+    try:
+        text = path.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        return profile
+    sections = split_sections(text)
+    profile.update(
+        chars=len(text),
+        tokens=count_tokens(text),
+        todo_count=text.count("TODO"),
+        sections=[[heading, len(body), count_tokens(body)] for heading, body in sections],
+        blocks=prompt_blocks(sections),
+    )
+    return profile
+
+
+class AgentIndex:
+    """Per-file metadata keyed by repo-relative path, persisted as JSON.
+
+    ``refresh`` reuses an entry when mtime and size are unchanged, rehashes when only the
+    mtime moved, and re-parses a file's front matter only when its content hash differs.
+    Body statistics are only needed by optimize, so ``profiles`` computes them on demand and
+    keeps them on the entry until the content hash changes.
+    """
+
+    def __init__(self, path: str | Path | None = DEFAULT_INDEX_PATH, fresh: bool = False) -> None:
+        self.path = Path(path) if path else None
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.stats = {"reused": 0, "rehashed": 0, "parsed": 0, "profiled": 0, "removed": 0}
+        self._dirty = False
+        if self.path and self.path.exists() and not fresh:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+            if data.get("version") == INDEX_VERSION and data.get("tokenizer") == tokenizer_name():
+                self.entries = data.get("entries", {})
+
+    def refresh(self, targets: Iterable[Path]) -> list[dict[str, Any]]:
+        """Bring entries for ``targets`` up to date and return them in the given order."""
+        result = []
+        for target in targets:
+            key = _key(target)
+            stat = target.stat()
+            entry = self.entries.get(key)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                self.stats["reused"] += 1
+            else:
+                sha256 = _file_sha256(target)
+                if entry and entry["sha256"] == sha256:
+                    entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                    self.stats["rehashed"] += 1
+                else:
+                    entry = build_entry(target, sha256, stat)
+                    self.entries[key] = entry
+                    self.stats["parsed"] += 1
+                self._dirty = True
+            result.append(entry)
+        for key in [key for key in self.entries if not (ROOT / key).exists()]:
+            del self.entries[key]
+            self.stats["removed"] += 1
+            self._dirty = True
+        return result
+
+    def profiles(self, entries: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """``build_profile`` output plus ``path`` for each refreshed entry, computed once per content hash."""
+        result = []
+        for entry in entries:
+            if entry.get("profile") is None:
+                entry["profile"] = build_profile(ROOT / entry["path"])
+                self.stats["profiled"] += 1
+                self._dirty = True
+            result.append({"path": entry["path"], **entry["profile"]})
+        return result
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        payload = {"version": INDEX_VERSION, "tokenizer": tokenizer_name(), "entries": self.entries}
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        temp_path.replace(self.path)
+        self._dirty = False
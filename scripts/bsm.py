@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Unified entry point for the BSM Python tooling: ``python scripts/bsm.py <command> [args]``.
+
+Each subcommand's module is imported only when that subcommand runs, so ``--help`` and
+``list`` start without loading yaml, pydantic or the provider clients.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+# os.path rather than pathlib: pathlib alone costs more than the rest of a trivial run.
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(SCRIPTS)
+
+# command -> (module in scripts/, one-line summary)
+COMMANDS = {
+    "validate": ("validate_agent", "Validate *.agent.md files against scripts/schema.yaml"),
+    "optimize": ("optimize_agent", "Prompt size, token-budget and boilerplate report for agent files"),
+    "triage": ("pr_triage_weekly", "Generate PR triage priorities and the weekly summary"),
+    "report": ("generate_report_with_ai", "Generate the weekly insights report from a CSV digest"),
+    "test-ai": ("test_ai_agent", "Smoke-test AI report generation"),
+}
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: bsm <command> [args...]", "", "commands:"]
+    lines.extend(f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items())
+    lines.extend(["", "Run 'bsm <command> --help' for command options."])
+    return "\n".join(lines)
+
+
+def run(command: str, argv: list[str]) -> int:
+    """Import the command's module on demand and run its ``main()`` with ``argv``."""
+    import importlib
+
+    module_name, _ = COMMANDS[command]
+    for path in (ROOT, SCRIPTS):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    module = importlib.import_module(module_name)
+    sys.argv = [f"bsm {command}", *argv]
+    result = module.main()
+    return result if isinstance(result, int) else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in {"-h", "--help", "help"}:
+        print(usage())
+        return 0
+    if argv[0] == "list":
+        print("\n".join(COMMANDS))
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"bsm: unknown command '{argv[0]}'\n\n{usage()}", file=sys.stderr)
+        return 2
+    return run(argv[0], argv[1:])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,297 @@
+"""Stream a CSV in chunks and fold it into a compact, mergeable summary digest."""
+
+from __future__ import annotations
+
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import math
+import mmap
+from collections import Counter
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, TextIO
+
+DEFAULT_CHUNK_ROWS = 10_000
+TAIL_HASH_BYTES = 4096
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+class ColumnStats:
+    """Count/missing/min/max/mean/variance plus bounded top values for one column.
+
+    Numeric moments are merged per chunk with Chan's parallel update, so the result does
+    not depend on chunk boundaries.
+    """
+
+    def __init__(self, max_categories: int = 20) -> None:
+        self.max_categories = max_categories
+        self.count = 0
+        self.missing = 0
+        self.numeric = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.top: Counter[str] = Counter()
+
+    def update(self, values: Iterable[str]) -> None:
+        numbers: list[float] = []
+        for value in values:
+            self.count += 1
+            value = value.strip()
+            if not value:
+                self.missing += 1
+                continue
+            number = _to_float(value)
+            if number is None:
+                if value in self.top or len(self.top) < self.max_categories * 10:
+                    self.top[value] += 1
+            else:
+                numbers.append(number)
+        if numbers:
+            self._merge_moments(len(numbers), math.fsum(numbers) / len(numbers), numbers)
+
+    def _merge_moments(self, n: int, mean: float, numbers: list[float]) -> None:
+        m2 = math.fsum((x - mean) ** 2 for x in numbers)
+        self.merge_numeric(n, mean, m2, min(numbers), max(numbers))
+
+    def merge_numeric(self, n: int, mean: float, m2: float, low: float, high: float) -> None:
+        total = self.numeric + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.numeric * n / total
+        self.numeric = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def summary(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"count": self.count, "missing": self.missing}
+        if self.numeric:
+            result.update(
+                numeric=self.numeric,
+                min=self.min,
+                max=self.max,
+                mean=round(self.mean, 6),
+                std=round(math.sqrt(self.m2 / self.numeric), 6),
+            )
+        if self.top:
+            result["top"] = dict(self.top.most_common(self.max_categories))
+            result["distinct_seen"] = len(self.top)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "missing": self.missing,
+            "numeric": self.numeric,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "top": dict(self.top),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], max_categories: int = 20) -> "ColumnStats":
+        stats = cls(max_categories)
+        for key in ("count", "missing", "numeric", "mean", "m2", "min", "max"):
+            setattr(stats, key, data[key])
+        stats.top = Counter(data.get("top", {}))
+        return stats
+
+
+class CsvDigest:
+    """Incremental per-column statistics and an optional bounded group-by."""
+
+    def __init__(self, group_by: str | None = None, max_categories: int = 20, max_groups: int = 1000) -> None:
+        self.group_by = group_by
+        self.max_categories = max_categories
+        self.max_groups = max_groups
+        self.header: list[str] = []
+        self.rows = 0
+        self.columns: dict[str, ColumnStats] = {}
+        self.groups: dict[str, dict[str, float]] = {}
+
+    def set_header(self, header: list[str]) -> None:
+        self.header = header
+        for name in header:
+            self.columns.setdefault(name, ColumnStats(self.max_categories))
+
+    def update(self, chunk: list[list[str]]) -> None:
+        if not chunk:
+            return
+        width = len(self.header)
+        rows = [row[:width] + [""] * (width - len(row)) for row in chunk]
+        self.rows += len(rows)
+        for name, values in zip(self.header, zip(*rows)):
+            self.columns[name].update(values)
+        if self.group_by in self.header:
+            self._update_groups(rows)
+
+    def _update_groups(self, rows: list[list[str]]) -> None:
+        key_index = self.header.index(self.group_by)
+        for row in rows:
+            key = row[key_index].strip() or "(empty)"
+            group = self.groups.get(key)
+            if group is None:
+                if len(self.groups) >= self.max_groups:
+                    key = "(other)"
+                group = self.groups.setdefault(key, {"count": 0})
+            group["count"] += 1
+            for name, value in zip(self.header, row):
+                if name == self.group_by:
+                    continue
+                number = _to_float(value.strip()) if value.strip() else None
+                if number is not None:
+                    group[f"sum:{name}"] = group.get(f"sum:{name}", 0.0) + number
+
+    def summary(self) -> dict[str, Any]:
+        digest: dict[str, Any] = {
+            "rows": self.rows,
+            "columns": {name: self.columns[name].summary() for name in self.header},
+        }
+        if self.groups:
+            digest["group_by"] = self.group_by
+            largest = sorted(self.groups.items(), key=lambda item: item[1]["count"], reverse=True)
+            digest["groups"] = dict(largest[: self.max_categories])
+            digest["group_count"] = len(self.groups)
+        return digest
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "group_by": self.group_by,
+            "header": self.header,
+            "rows": self.rows,
+            "columns": {name: stats.to_dict() for name, stats in self.columns.items()},
+            "groups": self.groups,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], max_categories: int = 20, max_groups: int = 1000) -> "CsvDigest":
+        digest = cls(data.get("group_by"), max_categories, max_groups)
+        digest.header = list(data["header"])
+        digest.rows = data["rows"]
+        digest.columns = {
+            name: ColumnStats.from_dict(stats, max_categories) for name, stats in data["columns"].items()
+        }
+        digest.groups = data.get("groups", {})
+        return digest
+
+
+def iter_chunks(handle: TextIO | Iterable[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[list[list[str]]]:
+    reader = csv.reader(handle)
+    while True:
+        chunk = list(itertools.islice(reader, chunk_rows))
+        if not chunk:
+            return
+        yield chunk
+
+
+def digest_csv(path: Path, group_by: str | None = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> CsvDigest:
+    """Fold the whole file into a digest while holding at most ``chunk_rows`` rows in memory."""
+    digest = CsvDigest(group_by=group_by)
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        header = next(csv.reader([handle.readline()]), [])
+        digest.set_header(header)
+        for chunk in iter_chunks(handle, chunk_rows):
+            digest.update(chunk)
+    return digest
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _tail_hash(handle: BinaryIO, start: int, offset: int) -> str:
+    handle.seek(max(start, offset - TAIL_HASH_BYTES))
+    return _sha256(handle.read(offset - handle.tell()))
+
+
+def _complete_lines(handle: BinaryIO, start: int, end: int) -> Iterator[str]:
+    handle.seek(start)
+    position = start
+    for line in handle:
+        position += len(line)
+        if position > end:
+            return
+        yield line.decode("utf-8")
+
+
+def digest_csv_incremental(
+    path: Path,
+    checkpoint_path: Path,
+    group_by: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> tuple[CsvDigest, str]:
+    """Fold only rows appended since the last checkpoint into the stored digest.
+
+    The checkpoint records the byte offset of the last complete row, the row count, hashes
+    of the header and of the bytes just before the offset, and the digest state. If the
+    header or tail no longer match (file rewritten or truncated), the digest is rebuilt
+    from scratch. A final row without a trailing newline is included in the returned digest
+    but not in the checkpoint, whose offset stays at that row's start, so the row is counted
+    once when later appends complete it. Returns the digest and ``"incremental"`` or ``"full"``.
+    """
+    checkpoint: dict[str, Any] = {}
+    if checkpoint_path.exists():
+        try:
+            checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        except ValueError:
+            checkpoint = {}
+
+    size = path.stat().st_size
+    with path.open("rb") as handle:
+        header_line = handle.readline()
+        header_end = handle.tell()
+        offset = checkpoint.get("offset", -1)
+        resumable = (
+            checkpoint.get("header_hash") == _sha256(header_line)
+            and checkpoint.get("group_by") == group_by
+            and header_end <= offset <= size
+            and checkpoint.get("tail_hash") == _tail_hash(handle, header_end, offset)
+        )
+        if resumable:
+            digest = CsvDigest.from_dict(checkpoint["digest"])
+            start, mode = offset, "incremental"
+        else:
+            digest = CsvDigest(group_by=group_by)
+            digest.set_header(next(csv.reader([header_line.decode("utf-8")]), []))
+            start, mode = header_end, "full"
+
+        end = start
+        if size > start:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = mapped.rfind(b"\n", start) + 1 or start
+        if end > start:
+            for chunk in iter_chunks(_complete_lines(handle, start, end), chunk_rows):
+                digest.update(chunk)
+
+        checkpoint = {
+            "offset": end,
+            "rows": digest.rows,
+            "group_by": group_by,
+            "header_hash": _sha256(header_line),
+            "tail_hash": _tail_hash(handle, header_end, end),
+            "digest": digest.to_dict(),
+        }
+        if size > end:
+            handle.seek(end)
+            tail = handle.read(size - end).decode("utf-8")
+            # The checkpoint may share containers with ``digest``; fold the tail into a copy.
+            digest = copy.deepcopy(digest)
+            digest.update(list(csv.reader([tail])))
+
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + ".tmp")
+    temp_path.write_text(json.dumps(checkpoint, ensure_ascii=False), encoding="utf-8")
+    temp_path.replace(checkpoint_path)
+    return digest, mode
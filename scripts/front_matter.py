@@ -0,0 +1,80 @@
+"""Header-only YAML front-matter reader for *.agent.md files."""
+
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from typing import Any, Callable
+
+DELIMITER = "---"
+
+
+@functools.lru_cache(maxsize=None)
+def loader() -> Any:
+    """libyaml's C loader when PyYAML was built with it, else the pure-Python SafeLoader.
+
+    Imported on first parse so callers that only hit cached entries never load yaml.
+    """
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def read_header(path: Path) -> str | None:
+    """Return the text between the opening and closing ``---`` lines, reading nothing past them.
+
+    Returns None when the file does not open with a delimiter or the header is never closed.
+    """
+    with path.open("r", encoding="utf-8") as handle:
+        if handle.readline().rstrip("\r\n") != DELIMITER:
+            return None
+        lines: list[str] = []
+        for line in handle:
+            if line.rstrip("\r\n") == DELIMITER:
+                return "".join(lines)
+            lines.append(line)
+    return None
+
+
+def _load_document(header: str | None, read_all: Callable[[], str]) -> dict[str, Any]:
+    import yaml
+
+    if header is not None:
+        parsed = yaml.load(header, Loader=loader())
+        if isinstance(parsed, dict):
+            return parsed
+    # No usable front matter: the file may be a plain YAML document (e.g. an unclosed header).
+    parsed = yaml.load(read_all(), Loader=loader())
+    if isinstance(parsed, dict):
+        return parsed
+    raise ValueError("File does not contain a YAML object or YAML front matter")
+
+
+def split_header(text: str) -> str | None:
+    """In-memory counterpart of ``read_header`` for callers that already hold the file text."""
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].rstrip("\r\n") != DELIMITER:
+        return None
+    for index, line in enumerate(lines[1:], start=1):
+        if line.rstrip("\r\n") == DELIMITER:
+            return "".join(lines[1:index])
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    target = Path(path)
+    return _load_document(read_header(target), lambda: target.read_text(encoding="utf-8"))
+
+
+def extract_front_matter(path: Path) -> dict[str, Any]:
+    """Parse the front matter of ``path``, cached per (path, mtime, size).
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    stat = path.stat()
+    return _parse(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def clear_cache() -> None:
+    _parse.cache_clear()
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -6,41 +8,53 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from bsm_config.src.api.client_factory import APIClientFactory
+from csv_digest import DEFAULT_CHUNK_ROWS, digest_csv, digest_csv_incremental
 
 
 def main():
-    if len(sys.argv) < 5:
-        print("Usage: python generate_report_with_ai.py --provider <provider> --model <model_name>")
-        sys.exit(1)
-
-    provider = sys.argv[2]
-    model = sys.argv[4]
-
-    data_path = Path("./data/latest.csv")
+    parser = argparse.ArgumentParser(description="Generate the weekly insights report from a CSV digest.")
+    parser.add_argument("--provider", required=True)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--data", default="./data/latest.csv")
+    parser.add_argument("--group-by", default=None, help="Column to aggregate counts and numeric sums by")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--output", default="./reports/weekly-insights.md")
+    parser.add_argument("--incremental", action="store_true", help="Only fold rows appended since the last run")
+    parser.add_argument("--checkpoint", default="./.cache/bsm-reports/latest.checkpoint.json")
+    args = parser.parse_args()
+
+    data_path = Path(args.data)
     if not data_path.exists():
-        print("❌ No data file found at ./data/latest.csv")
+        print(f"❌ No data file found at {data_path}")
         sys.exit(1)
 
-    raw_data = data_path.read_text(encoding="utf-8")
+    if args.incremental:
+        digest, mode = digest_csv_incremental(
+            data_path, Path(args.checkpoint), group_by=args.group_by, chunk_rows=args.chunk_rows
+        )
+        print(f"ℹ️ {mode} scan of {data_path}")
+    else:
+        digest = digest_csv(data_path, group_by=args.group_by, chunk_rows=args.chunk_rows)
+
+    # Imported here so --help and argument errors do not pay for the provider stack.
+    from bsm_config.src.api.client_factory import APIClientFactory
 
-    factory = APIClientFactory.fromProviders([provider])
-    client = factory.getPrimaryClient()
+    factory = APIClientFactory.fromProviders([args.provider])
 
-    report = client.generateReport(
+    report = factory.generateReport(
         {
             "title": "BSM Weekly Insights Report",
-            "data": raw_data,
+            "data": json.dumps(digest.summary(), ensure_ascii=False),
             "format": "markdown",
-            "model": model,
+            "model": args.model,
         }
     )
 
-    output_path = Path("./reports/weekly-insights.md")
+    output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(report["content"], encoding="utf-8")
 
-    print(f"✅ Report generated successfully at {output_path}")
+    print(f"✅ Report generated successfully at {output_path} ({digest.rows} rows summarized)")
 
 
 if __name__ == "__main__":
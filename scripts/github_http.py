@@ -0,0 +1,262 @@
+"""Keep-alive, conditional-request-aware GitHub REST fetching with concurrent pagination."""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+DEFAULT_API_URL = "https://api.github.com"
+LINK_LAST_RE = re.compile(r'<([^>]+)>;\s*rel="last"')
+
+
+class GitHubError(RuntimeError):
+    def __init__(self, status: int, url: str, body: str) -> None:
+        super().__init__(f"GitHub API {status} for {url}: {body[:200]}")
+        self.status = status
+
+
+class GitHubClient:
+    """GitHub GET client with one persistent connection per worker thread.
+
+    Responses are cached on disk with their ETag/Last-Modified validators, so repeated runs
+    send conditional requests and unchanged pages come back as 304 Not Modified. All threads
+    sharing a client share one budget: at most ``max_workers`` requests in flight, and a
+    pause until reset once X-RateLimit-Remaining reaches zero.
+    """
+
+    def __init__(
+        self,
+        api_url: str | None = None,
+        cache_dir: str | Path | None = ".cache/github",
+        token: str | None = None,
+        max_workers: int = 4,
+        timeout: float = 30,
+    ) -> None:
+        self.api_url = (api_url or os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        parts = urlsplit(self.api_url)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.base_path = parts.path
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.token = token if token is not None else os.getenv("GITHUB_TOKEN")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Every open per-thread connection, so close() can reach the workers' ones too.
+        self._connections: list[http.client.HTTPConnection] = []
+        # Long-lived workers so each keeps its keep-alive connection across paginated calls.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gh-fetch")
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self.rate_remaining: int | None = None
+        self.rate_reset = 0.0
+        self.stats = {"requests": 0, "not_modified": 0, "bytes": 0, "connections": 0, "rate_limit_waits": 0}
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(self.host, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+                self.stats["connections"] += 1
+        return conn
+
+    def _reset_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+        self._local.conn = None
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _cache_path(self, path: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(path.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> tuple[Any, dict[str, str]]:
+        """GET ``path`` (relative to the API root) and return (json_body, headers)."""
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        full_path = f"{self.base_path}{path}"
+        headers = {"Accept": "application/vnd.github+json", "User-Agent": "wejdan-agent"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        cache_path = self._cache_path(full_path)
+        cached = None
+        if cache_path and cache_path.exists():
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        status, response_headers, body = self._request(full_path, headers)
+        if status == 304 and cached is not None:
+            self._count("not_modified")
+            return cached["body"], cached["headers"]
+        if status >= 400:
+            raise GitHubError(status, full_path, body.decode("utf-8", "replace"))
+
+        data = json.loads(body.decode("utf-8")) if body else None
+        kept_headers = {k: v for k, v in response_headers.items() if k in {"link", "etag", "last-modified"}}
+        if cache_path and (kept_headers.get("etag") or kept_headers.get("last-modified")):
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "etag": kept_headers.get("etag"),
+                        "last_modified": kept_headers.get("last-modified"),
+                        "headers": kept_headers,
+                        "body": data,
+                    }
+                ),
+                encoding="utf-8",
+            )
+        return data, kept_headers
+
+    def _wait_for_rate_limit(self) -> None:
+        with self._lock:
+            delay = self.rate_reset - time.time() if self.rate_remaining == 0 else 0.0
+            if delay > 0:
+                self.stats["rate_limit_waits"] += 1
+        if delay > 0:
+            time.sleep(delay)
+
+    def _track_rate_limit(self, headers: dict[str, str]) -> None:
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            self.rate_remaining = int(remaining)
+            self.rate_reset = float(reset)
+
+    def _request(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        with self._slots:
+            self._wait_for_rate_limit()
+            status, response_headers, body = self._send(path, headers)
+        self._track_rate_limit(response_headers)
+        return status, response_headers, body
+
+    def _send(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # The server may have closed an idle keep-alive connection; reconnect once.
+                self._reset_connection()
+                if attempt:
+                    raise
+                continue
+            self._count("requests")
+            self._count("bytes", len(body))
+            if response.will_close:
+                self._reset_connection()
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, body
+        raise RuntimeError("unreachable")
+
+    def get_paginated(
+        self, path: str, params: dict[str, Any], per_page: int = 100, limit: int | None = None
+    ) -> list[Any]:
+        """Fetch page 1, then the remaining pages concurrently once the Link header gives the count."""
+        params = {**params, "per_page": per_page}
+        first, headers = self.get(path, {**params, "page": 1})
+        items = list(first or [])
+        if limit and len(items) >= limit:
+            return items[:limit]
+
+        last_page = _last_page(headers.get("link", ""))
+        if last_page is None:
+            # No Link header (e.g. a minimal stub server): page sequentially until a short page.
+            page = 1
+            while first and len(first) >= per_page and not (limit and len(items) >= limit):
+                page += 1
+                first, _ = self.get(path, {**params, "page": page})
+                items.extend(first or [])
+            return items[:limit] if limit else items
+
+        if limit:
+            last_page = min(last_page, -(-limit // per_page))
+        pages = range(2, last_page + 1)
+        for data, _ in self._executor.map(lambda page: self.get(path, {**params, "page": page}), pages):
+            items.extend(data or [])
+        return items[:limit] if limit else items
+
+    def get_paginated_until(
+        self,
+        path: str,
+        params: dict[str, Any],
+        stop: Callable[[Any], bool],
+        per_page: int = 100,
+    ) -> tuple[list[Any], dict[str, int]]:
+        """Page sequentially and stop at the first item for which ``stop(item)`` is true.
+
+        Meant for listings sorted so that every later item also matches ``stop``. Returns
+        the items before the stop point and a scan summary with pages fetched, the total
+        page count from the Link header, and bytes fetched vs. estimated bytes skipped.
+        """
+        params = {**params, "per_page": per_page}
+        items: list[Any] = []
+        scan = {"pages_fetched": 0, "total_pages": 0, "bytes_fetched": 0, "pages_skipped": 0, "bytes_skipped": 0}
+        page = 1
+        while True:
+            data, headers = self.get(path, {**params, "page": page})
+            data = data or []
+            scan["pages_fetched"] += 1
+            scan["bytes_fetched"] += len(json.dumps(data))
+            scan["total_pages"] = max(scan["total_pages"], _last_page(headers.get("link", "")) or page)
+            for item in data:
+                if stop(item):
+                    break
+                items.append(item)
+            else:
+                if len(data) >= per_page:
+                    page += 1
+                    continue
+            break
+        scan["pages_skipped"] = max(0, scan["total_pages"] - scan["pages_fetched"])
+        scan["bytes_skipped"] = scan["pages_skipped"] * scan["bytes_fetched"] // scan["pages_fetched"]
+        return items, scan
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _last_page(link_header: str) -> int | None:
+    match = LINK_LAST_RE.search(link_header)
+    if not match:
+        return None
+    pages = parse_qs(urlsplit(match.group(1)).query).get("page")
+    return int(pages[0]) if pages else None
@@ -4,35 +4,115 @@
 from __future__ import annotations
 
 import argparse
-import glob
+import json
 import os
 from pathlib import Path
+from typing import Any
 
-ROOT = Path(__file__).resolve().parents[1]
+from agent_index import DEFAULT_INDEX_PATH, AgentIndex, find_agent_files
+from prompt_profile import near_duplicates, tokenizer_name
 
+DEFAULT_BUDGETS_PATH = Path(__file__).resolve().with_name("prompt_budgets.json")
 
-def find_targets() -> list[Path]:
-    paths = glob.glob("agents/*.agent.md") + glob.glob(".github/agents/*.agent.md")
-    return [Path(p).resolve() for p in paths if Path(p).is_file()]
+
+def load_budgets(path: str | Path = DEFAULT_BUDGETS_PATH) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def profile_agent(entry: dict[str, Any], budgets: dict[str, Any]) -> dict[str, Any]:
+    """Token counts, estimated per-call latency/cost and budget breaches for one profiled file."""
+    limits = {**budgets, **budgets.get("agents", {}).get(entry["path"], {})}
+    latency = limits["latency"]
+    pricing = limits["pricing_per_1k_tokens_usd"]
+    output_tokens = limits["expected_output_tokens"]
+    tokens = entry["tokens"]
+    seconds = (
+        latency["base_seconds"]
+        + tokens / latency["prefill_tokens_per_second"]
+        + output_tokens / latency["output_tokens_per_second"]
+    )
+    cost = (tokens * pricing["input"] + output_tokens * pricing["output"]) / 1000
+
+    breaches = []
+    if tokens > limits["max_tokens_per_agent"]:
+        breaches.append(f"{tokens} tokens > {limits['max_tokens_per_agent']} per agent")
+    for heading, _, section_tokens in entry["sections"]:
+        if section_tokens > limits["max_tokens_per_section"]:
+            breaches.append(f"section '{heading}' {section_tokens} tokens > {limits['max_tokens_per_section']}")
+    if seconds > limits["max_latency_seconds"]:
+        breaches.append(f"estimated latency {seconds:.2f}s > {limits['max_latency_seconds']}s")
+    if cost > limits["max_cost_per_call_usd"]:
+        breaches.append(f"estimated cost ${cost:.4f} > ${limits['max_cost_per_call_usd']}")
+
+    return {
+        "path": entry["path"],
+        "tokens": tokens,
+        "sections": [{"heading": h, "chars": c, "tokens": t} for h, c, t in entry["sections"]],
+        "estimated_latency_seconds": round(seconds, 3),
+        "estimated_cost_usd": round(cost, 6),
+        "over_budget": breaches,
+    }
+
+
+def find_boilerplate(entries: list[dict[str, Any]], threshold: float) -> list[dict[str, Any]]:
+    """Near-duplicate paragraphs that appear in more than one agent file, largest saving first."""
+    blocks = [(entry["path"], block) for entry in entries for block in entry["blocks"]]
+    clusters = []
+    for members in near_duplicates([block["signature"] for _, block in blocks], threshold):
+        occurrences = [{"path": blocks[i][0], "section": blocks[i][1]["section"]} for i in members]
+        if len({item["path"] for item in occurrences}) < 2:
+            continue
+        sizes = sorted(blocks[i][1]["tokens"] for i in members)
+        clusters.append(
+            {
+                "preview": blocks[members[0]][1]["preview"],
+                "tokens": sizes[0],
+                "occurrences": occurrences,
+                # Factoring the block out leaves one shared copy.
+                "saving_tokens": sum(sizes[1:]),
+            }
+        )
+    return sorted(clusters, key=lambda cluster: cluster["saving_tokens"], reverse=True)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--pr-number", default="")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Shared agent-file index")
+    parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS_PATH), help="Token/latency/cost budgets JSON")
+    parser.add_argument("--report", help="Write the machine-readable profile to this JSON file")
     args = parser.parse_args()
 
     optimize_needed = False
     suggestions: list[str] = []
 
-    for path in find_targets():
-        text = path.read_text(encoding="utf-8")
-        if len(text) > 6000:
+    index = AgentIndex(args.index)
+    entries = index.profiles(index.refresh(find_agent_files()))
+    index.save()
+    budgets = load_budgets(args.budgets)
+
+    for entry in entries:
+        if entry["chars"] > 6000:
+            optimize_needed = True
+            suggestions.append(f"{entry['path']} is large (>6KB): consider trimming prompt scope.")
+        if entry["todo_count"]:
             optimize_needed = True
-            suggestions.append(f"{path.relative_to(ROOT)} is large (>6KB): consider trimming prompt scope.")
-        if "TODO" in text:
+            suggestions.append(f"{entry['path']} contains TODO markers.")
+
+    agents = [profile_agent(entry, budgets) for entry in entries]
+    for agent in agents:
+        for breach in agent["over_budget"]:
             optimize_needed = True
-            suggestions.append(f"{path.relative_to(ROOT)} contains TODO markers.")
+            suggestions.append(f"{agent['path']} is over its prompt budget: {breach}.")
+    duplicates = find_boilerplate(entries, budgets["duplicate_similarity"])
+    for cluster in duplicates:
+        optimize_needed = True
+        files = ", ".join(sorted({item["path"] for item in cluster["occurrences"]}))
+        suggestions.append(
+            f"Shared boilerplate (~{cluster['tokens']} tokens) in {files}: "
+            f"factor out to save ~{cluster['saving_tokens']} tokens per full load. \"{cluster['preview']}\""
+        )
 
     if suggestions:
         print("Optimization suggestions:")
@@ -41,10 +121,34 @@ def main() -> int:
     else:
         print("No optimization needed.")
 
+    total_tokens = sum(agent["tokens"] for agent in agents)
+    print(f"Prompt tokens ({tokenizer_name()}): {total_tokens} across {len(agents)} agent file(s).")
+    for agent in sorted(agents, key=lambda item: item["tokens"], reverse=True):
+        print(
+            f"  {agent['tokens']:>6}  {agent['estimated_latency_seconds']:>6.2f}s  "
+            f"${agent['estimated_cost_usd']:.4f}  {agent['path']}"
+        )
+
+    if args.report:
+        report = {
+            "tokenizer": tokenizer_name(),
+            "model": budgets.get("model"),
+            "total_tokens": total_tokens,
+            "optimize_needed": optimize_needed,
+            "agents": agents,
+            "duplicates": duplicates,
+            "suggestions": suggestions,
+        }
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
     github_output = os.getenv("GITHUB_OUTPUT")
     if github_output:
         with open(github_output, "a", encoding="utf-8") as handle:
             handle.write(f"optimize_needed={'true' if optimize_needed else 'false'}\n")
+            handle.write(f"over_budget={'true' if any(a['over_budget'] for a in agents) else 'false'}\n")
+            handle.write(f"prompt_tokens={total_tokens}\n")
+            handle.write(f"duplicate_tokens={sum(c['saving_tokens'] for c in duplicates)}\n")
 
     if args.dry_run:
         print(f"Dry-run mode enabled for PR #{args.pr_number or 'N/A'}")
@@ -0,0 +1,147 @@
+"""Local SQLite snapshot store of PR metadata for week-over-week triage trends."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sqlite3
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pulls (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,
+    draft INTEGER NOT NULL DEFAULT 0,
+    labels TEXT NOT NULL DEFAULT '[]',
+    priority TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    closed_at TEXT,
+    merged_at TEXT,
+    seen_at TEXT NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS pulls_repo_state ON pulls (repo, state);
+CREATE INDEX IF NOT EXISTS pulls_repo_closed_at ON pulls (repo, closed_at);
+CREATE TABLE IF NOT EXISTS runs (
+    repo TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    open_count INTEGER NOT NULL,
+    p0_open INTEGER NOT NULL,
+    p1_open INTEGER NOT NULL,
+    p2_open INTEGER NOT NULL,
+    avg_open_age REAL NOT NULL,
+    PRIMARY KEY (repo, run_at)
+);
+"""
+
+
+def _ts(value: str) -> dt.datetime:
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class PRSnapshotStore:
+    """Upserts PR metadata on each run and answers weekly/trend questions locally.
+
+    Timestamps are stored as GitHub's ISO-8601 UTC strings, which sort chronologically.
+    """
+
+    def __init__(self, path: str | Path = ".cache/pr-snapshots.sqlite") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.executescript(SCHEMA)
+
+    def upsert(
+        self,
+        repo: str,
+        pulls: Iterable[dict[str, Any]],
+        classify: Callable[[dict[str, Any]], str],
+        seen_at: dt.datetime,
+    ) -> int:
+        rows = [
+            (
+                repo,
+                pr["number"],
+                pr.get("title") or "",
+                "merged" if pr.get("merged_at") else pr.get("state") or ("closed" if pr.get("closed_at") else "open"),
+                int(bool(pr.get("draft"))),
+                json.dumps(sorted(lbl["name"] for lbl in pr.get("labels", []))),
+                classify(pr),
+                pr["created_at"],
+                pr.get("updated_at"),
+                pr.get("closed_at"),
+                pr.get("merged_at"),
+                _iso(seen_at),
+            )
+            for pr in pulls
+        ]
+        with self.db:
+            self.db.executemany(
+                """
+                INSERT INTO pulls (repo, number, title, state, draft, labels, priority,
+                                   created_at, updated_at, closed_at, merged_at, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (repo, number) DO UPDATE SET
+                    title = excluded.title, state = excluded.state, draft = excluded.draft,
+                    labels = excluded.labels, priority = excluded.priority,
+                    updated_at = excluded.updated_at, closed_at = excluded.closed_at,
+                    merged_at = excluded.merged_at, seen_at = excluded.seen_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def record_run(self, repo: str, run_at: dt.datetime, priorities: list[str], avg_open_age: float) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repo,
+                    _iso(run_at),
+                    len(priorities),
+                    priorities.count("P0"),
+                    priorities.count("P1"),
+                    priorities.count("P2"),
+                    avg_open_age,
+                ),
+            )
+
+    def closed_since(self, repo: str, since: dt.datetime) -> tuple[int, int]:
+        """Return (closed_without_merge, merged) with closed_at >= since."""
+        row = self.db.execute(
+            """
+            SELECT COALESCE(SUM(merged_at IS NULL), 0), COALESCE(SUM(merged_at IS NOT NULL), 0)
+            FROM pulls WHERE repo = ? AND closed_at >= ?
+            """,
+            (repo, _iso(since)),
+        ).fetchone()
+        return row[0], row[1]
+
+    def median_time_to_merge(self, repo: str, since: dt.datetime) -> float | None:
+        """Median hours from creation to merge for PRs merged since ``since``."""
+        rows = self.db.execute(
+            "SELECT created_at, merged_at FROM pulls WHERE repo = ? AND closed_at >= ? AND merged_at IS NOT NULL",
+            (repo, _iso(since)),
+        ).fetchall()
+        hours = [(_ts(merged) - _ts(created)).total_seconds() / 3600 for created, merged in rows]
+        return statistics.median(hours) if hours else None
+
+    def backlog_trend(self, repo: str, runs: int = 8) -> list[tuple[str, int, int, float]]:
+        """Most recent runs, oldest first: (run_at, open_count, p0_open, avg_open_age)."""
+        rows = self.db.execute(
+            "SELECT run_at, open_count, p0_open, avg_open_age FROM runs WHERE repo = ? ORDER BY run_at DESC LIMIT ?",
+            (repo, runs),
+        ).fetchall()
+        return list(reversed(rows))
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def _iso(value: dt.datetime) -> str:
+    return value.astimezone(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -4,124 +4,133 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
-from urllib.request import Request, urlopen
-
-
-P0_KEYWORDS = {
-    "security", "cve", "vuln", "vulnerability", "hotfix", "outage", "incident",
-    "production down", "auth bypass", "rce", "secret leak", "critical",
-}
-P1_KEYWORDS = {
-    "release", "launch", "milestone", "go-live", "feature", "shipping", "beta",
-    "roadmap", "docs", "documentation", "ci", "workflow",
-}
-CLOSE_REASON_KEYWORDS = {"wip", "draft", "experiment", "spike", "duplicate"}
-
-
-def gh_get(url: str) -> Any:
-    req = Request(url, headers={"Accept": "application/vnd.github+json", "User-Agent": "wejdan-agent"})
-    with urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
-
-
-def fetch_pulls(repo: str, state: str, per_page: int = 100, limit: int | None = None) -> list[dict[str, Any]]:
-    pulls: list[dict[str, Any]] = []
-    page = 1
-    while True:
-        data = gh_get(f"https://api.github.com/repos/{repo}/pulls?state={state}&per_page={per_page}&page={page}")
-        if not data:
-            break
-        pulls.extend(data)
-        if limit and len(pulls) >= limit:
-            return pulls[:limit]
-        if len(data) < per_page:
-            break
-        page += 1
-    return pulls
+from typing import TYPE_CHECKING, Any
+
+from triage_rules import DEFAULT_RULES_PATH, TriageRules
+
+if TYPE_CHECKING:
+    from github_http import GitHubClient
+    from pr_snapshot_store import PRSnapshotStore
+
+RULES = TriageRules.load(DEFAULT_RULES_PATH)
+
+
+def fetch_pulls(
+    repo: str,
+    state: str,
+    per_page: int = 100,
+    limit: int | None = None,
+    client: GitHubClient | None = None,
+) -> list[dict[str, Any]]:
+    if client is None:
+        from github_http import GitHubClient
+
+        with GitHubClient() as owned:
+            return fetch_pulls(repo, state, per_page, limit, owned)
+    return client.get_paginated(f"/repos/{repo}/pulls", {"state": state}, per_page=per_page, limit=limit)
+
+
+def parse_ts(value: str) -> dt.datetime:
+    return dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def fetch_closed_since(
+    repo: str, since: dt.datetime, client: GitHubClient, per_page: int = 100
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
+    """Closed PRs with closed_at >= since, scanning by updated_at desc and stopping early.
+
+    closed_at never exceeds updated_at, so once updated_at drops below ``since`` no later
+    page can contain a PR closed inside the window.
+    """
+    pulls, scan = client.get_paginated_until(
+        f"/repos/{repo}/pulls",
+        {"state": "closed", "sort": "updated", "direction": "desc"},
+        stop=lambda pr: parse_ts(pr["updated_at"]) < since,
+        per_page=per_page,
+    )
+    return [pr for pr in pulls if pr.get("closed_at") and parse_ts(pr["closed_at"]) >= since], scan
 
 
 def classify(pr: dict[str, Any]) -> str:
-    title = (pr.get("title") or "").lower()
-    if any(k in title for k in P0_KEYWORDS):
-        return "P0"
-    labels = {lbl["name"].lower() for lbl in pr.get("labels", [])}
-    if {"security", "sev0", "blocker"} & labels:
-        return "P0"
-    if any(k in title for k in P1_KEYWORDS) or {"release", "feature", "p1"} & labels:
-        return "P1"
-    return "P2"
+    return RULES.classify(pr)
 
 
 def decision(pr: dict[str, Any], priority: str, now: dt.datetime) -> tuple[str, str]:
-    title = (pr.get("title") or "").lower()
-    age_days = (now - dt.datetime.fromisoformat(pr["created_at"].replace("Z", "+00:00"))).days
-    if pr.get("draft"):
-        return "request changes", "PR مسودة (Draft) ويحتاج استكمال قبل الدمج"
-    if priority == "P0":
-        return "merge", "تصنيف P0 ولا تظهر مؤشرات تمنع الدمج السريع"
-    if priority == "P1":
-        if age_days > 30:
-            return "request changes", "مرتبط بإطلاق لكن عمره مرتفع ويحتاج تحديث قبل الدمج"
-        return "merge", "ميزة مرتبطة بالإطلاق وقابلة للدمج بعد مراجعة سريعة"
-    if any(k in title for k in CLOSE_REASON_KEYWORDS) or age_days > 60:
-        return "close", "PR غير حرج/قديم أو تجريبي؛ الإغلاق أفضل لتقليل الضوضاء"
-    return "request changes", "تحسين غير حرج ويحتاج تنقيح قبل القرار النهائي"
-
-
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--repo", default="LexBANK/BSM")
-    parser.add_argument("--open-limit", type=int, default=9)
-    parser.add_argument("--output", default="reports/WEEKLY-PR-TRIAGE.md")
-    args = parser.parse_args()
+    return RULES.decision(pr, priority, now)
 
-    now = dt.datetime.now(dt.timezone.utc)
-    open_prs = fetch_pulls(args.repo, "open", limit=args.open_limit)
+
+def format_hours(hours: float | None) -> str:
+    if hours is None:
+        return "غير متاح"
+    return f"{hours / 24:.1f} يوم" if hours >= 48 else f"{hours:.1f} ساعة"
+
+
+def triage_repo(repo: str, client: GitHubClient, open_limit: int, now: dt.datetime) -> dict[str, Any]:
+    """Fetch and classify one repository; safe to run concurrently on a shared client.
+
+    A failure (403/404, network error) is returned as ``{"repo", "error"}`` so one bad repo
+    does not abort a multi-repo report.
+    """
+    try:
+        return _triage_repo(repo, client, open_limit, now)
+    except Exception as exc:
+        return {"repo": repo, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def _triage_repo(repo: str, client: GitHubClient, open_limit: int, now: dt.datetime) -> dict[str, Any]:
+    open_prs = fetch_pulls(repo, "open", limit=open_limit, client=client)
     open_prs.sort(key=lambda p: p["created_at"])
 
     triage_rows = []
-    for pr in open_prs:
-        prio = classify(pr)
-        action, reason = decision(pr, prio, now)
+    for pr, (prio, action, reason) in zip(open_prs, RULES.score_batch(open_prs, now)):
         triage_rows.append({"number": pr["number"], "title": pr["title"], "priority": prio, "decision": action, "reason": reason})
 
     triage_rows.sort(key=lambda r: (r["priority"], r["number"]))
 
-    closed_week = fetch_pulls(args.repo, "closed")
     week_ago = now - dt.timedelta(days=7)
-    closed_count = 0
-    merged_count = 0
-    for pr in closed_week:
-        closed_at = dt.datetime.fromisoformat(pr["closed_at"].replace("Z", "+00:00"))
-        if closed_at >= week_ago:
-            if pr.get("merged_at"):
-                merged_count += 1
-            else:
-                closed_count += 1
+    closed_week, scan = fetch_closed_since(repo, week_ago, client)
 
     ages = []
     for pr in open_prs:
-        created = dt.datetime.fromisoformat(pr["created_at"].replace("Z", "+00:00"))
+        created = parse_ts(pr["created_at"])
         ages.append((now - created).days)
     avg_age = (sum(ages) / len(ages)) if ages else 0.0
 
+    return {
+        "repo": repo,
+        "open_prs": open_prs,
+        "triage_rows": triage_rows,
+        "closed_week": closed_week,
+        "scan": scan,
+        "avg_age": avg_age,
+    }
+
+
+def summarize_repo(result: dict[str, Any], store: PRSnapshotStore, now: dt.datetime) -> None:
+    """Upsert one repo's snapshot and attach the store-backed weekly and trend figures."""
+    repo = result["repo"]
+    week_ago = now - dt.timedelta(days=7)
+    store.upsert(repo, result["open_prs"] + result["closed_week"], classify, now)
+    store.record_run(repo, now, [row["priority"] for row in result["triage_rows"]], result["avg_age"])
+    result["closed_count"], result["merged_count"] = store.closed_since(repo, week_ago)
+    result["ttm_week"] = store.median_time_to_merge(repo, week_ago)
+    result["ttm_month"] = store.median_time_to_merge(repo, now - dt.timedelta(days=30))
+    result["trend"] = store.backlog_trend(repo)
+
+
+def render_repo(result: dict[str, Any], level: str = "##") -> list[str]:
+    if "error" in result:
+        return [f"> ⚠️ تعذّر فرز هذا المستودع: `{result['error']}`"]
     lines = [
-        "# تقرير الفرز الأسبوعي للـ PRs",
-        "",
-        f"- المستودع: `{args.repo}`",
-        f"- وقت التوليد (UTC): {now.isoformat()}",
-        f"- عدد PRs المفتوحة (ضمن نطاق العمل): {len(open_prs)}",
-        "",
-        "## ترتيب التنفيذ (P0 ثم P1 ثم P2)",
+        f"{level} ترتيب التنفيذ (P0 ثم P1 ثم P2)",
         "",
         "| PR | الأولوية | قرار خلال 72 ساعة | السبب |",
         "|---|---|---|---|",
     ]
 
-    for row in triage_rows:
+    for row in result["triage_rows"]:
         lines.append(
             f"| #{row['number']} - {row['title']} | {row['priority']} | **{row['decision']}** | {row['reason']} |"
         )
@@ -129,20 +138,129 @@ def main() -> None:
     lines.extend(
         [
             "",
-            "## ملخص أسبوعي",
+            f"{level} ملخص أسبوعي",
+            "",
+            f"- المفتوحة: **{len(result['open_prs'])}**",
+            f"- المغلقة (بدون دمج) خلال آخر 7 أيام: **{result['closed_count']}**",
+            f"- المدمجة خلال آخر 7 أيام: **{result['merged_count']}**",
+            f"- متوسط عمر PR المفتوح: **{result['avg_age']:.1f} يوم**",
+            "",
+            f"{level} الاتجاهات",
             "",
-            f"- المفتوحة: **{len(open_prs)}**",
-            f"- المغلقة (بدون دمج) خلال آخر 7 أيام: **{closed_count}**",
-            f"- المدمجة خلال آخر 7 أيام: **{merged_count}**",
-            f"- متوسط عمر PR المفتوح: **{avg_age:.1f} يوم**",
+            f"- وسيط زمن الدمج (آخر 7 أيام): **{format_hours(result['ttm_week'])}**",
+            f"- وسيط زمن الدمج (آخر 30 يوماً): **{format_hours(result['ttm_month'])}**",
+            "",
+            "| التشغيل (UTC) | المفتوحة | P0 المفتوحة | متوسط العمر (يوم) |",
+            "|---|---|---|---|",
         ]
     )
+    for run_at, open_count, p0_open, run_avg_age in result["trend"]:
+        lines.append(f"| {run_at} | {open_count} | {p0_open} | {run_avg_age:.1f} |")
+    return lines
+
+
+def resolve_repos(args: argparse.Namespace, client: GitHubClient) -> list[str]:
+    repos = [r.strip() for value in args.repos for r in value.split(",") if r.strip()]
+    if args.org:
+        org_repos = client.get_paginated(f"/orgs/{args.org}/repos", {"type": "all"})
+        repos.extend(r["full_name"] for r in org_repos if not r.get("archived"))
+    return list(dict.fromkeys(repos)) or [args.repo]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repo", default="LexBANK/BSM")
+    parser.add_argument("--repos", action="append", default=[], help="Comma-separated repos for a multi-repo report")
+    parser.add_argument("--org", default=None, help="Triage every non-archived repo in this organization")
+    parser.add_argument("--open-limit", type=int, default=9)
+    parser.add_argument("--output", default="reports/WEEKLY-PR-TRIAGE.md")
+    parser.add_argument("--api-url", default=None, help="GitHub API root (defaults to GITHUB_API_URL or api.github.com)")
+    parser.add_argument("--cache-dir", default=".cache/github", help="ETag cache directory; empty to disable")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent GitHub requests shared by all repos")
+    parser.add_argument("--repo-workers", type=int, default=4, help="Repositories triaged in parallel")
+    parser.add_argument("--store", default=".cache/pr-snapshots.sqlite", help="SQLite PR snapshot store")
+    parser.add_argument("--rules", default=str(DEFAULT_RULES_PATH), help="Triage rules JSON file")
+    args = parser.parse_args()
+
+    # The HTTP and SQLite layers load only once there is work to do, keeping --help fast.
+    from github_http import GitHubClient
+    from pr_snapshot_store import PRSnapshotStore
+
+    global RULES
+    RULES = TriageRules.load(args.rules)
+
+    now = dt.datetime.now(dt.timezone.utc)
+    with GitHubClient(api_url=args.api_url, cache_dir=args.cache_dir or None, max_workers=args.workers) as client:
+        repos = resolve_repos(args, client)
+
+        # Repos run in parallel but share one client, so its request slots and rate-limit
+        # tracking are a single budget; wall-clock follows the slowest repo.
+        with ThreadPoolExecutor(max_workers=max(1, min(args.repo_workers, len(repos)))) as pool:
+            results = list(pool.map(lambda repo: triage_repo(repo, client, args.open_limit, now), repos))
+
+    failed = [result for result in results if "error" in result]
+    store = PRSnapshotStore(args.store)
+    for result in results:
+        if "error" not in result:
+            summarize_repo(result, store, now)
+    store.close()
+
+    if len(results) == 1:
+        result = results[0]
+        lines = [
+            "# تقرير الفرز الأسبوعي للـ PRs",
+            "",
+            f"- المستودع: `{result['repo']}`",
+            f"- وقت التوليد (UTC): {now.isoformat()}",
+            f"- عدد PRs المفتوحة (ضمن نطاق العمل): {len(result.get('open_prs', []))}",
+            "",
+            *render_repo(result),
+        ]
+    else:
+        lines = [
+            "# تقرير الفرز الأسبوعي للـ PRs",
+            "",
+            f"- المستودعات: {len(results)}",
+            f"- وقت التوليد (UTC): {now.isoformat()}",
+            "",
+            "## نظرة عامة",
+            "",
+            "| المستودع | المفتوحة | P0 | المغلقة (7 أيام) | المدمجة (7 أيام) | متوسط العمر (يوم) |",
+            "|---|---|---|---|---|---|",
+        ]
+        for result in results:
+            if "error" in result:
+                lines.append(f"| `{result['repo']}` | ⚠️ | - | - | - | - |")
+                continue
+            p0_open = sum(1 for row in result["triage_rows"] if row["priority"] == "P0")
+            lines.append(
+                f"| `{result['repo']}` | {len(result['open_prs'])} | {p0_open} | {result['closed_count']} "
+                f"| {result['merged_count']} | {result['avg_age']:.1f} |"
+            )
+        for result in results:
+            lines.extend(["", f"## `{result['repo']}`", "", *render_repo(result, level="###")])
 
     out = Path(args.output)
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text("\n".join(lines) + "\n", encoding="utf-8")
     print(f"Wrote {out}")
+    for result in failed:
+        print(f"{result['repo']} failed: {result['error']}")
+    for result in results:
+        if "error" in result:
+            continue
+        scan = result["scan"]
+        print(
+            f"{result['repo']} closed-PR scan: {scan['pages_fetched']}/{scan['total_pages']} pages fetched, "
+            f"{scan['pages_skipped']} pages (~{scan['bytes_skipped']} bytes) skipped"
+        )
+    stats = client.stats
+    print(
+        f"GitHub: {stats['requests']} requests over {stats['connections']} connections, "
+        f"{stats['not_modified']} not modified, {stats['bytes']} bytes"
+    )
+    return 1 if len(failed) == len(results) else 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
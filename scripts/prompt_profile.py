@@ -0,0 +1,116 @@
+"""Offline prompt token estimates and MinHash near-duplicate detection for agent files."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import math
+import random
+import re
+from typing import Callable, Iterable
+
+# GPT-style pre-tokenization: contractions, letter runs, short digit runs, punctuation runs, whitespace.
+PRETOKEN_RE = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+")
+WORD_RE = re.compile(r"\w+")
+SHINGLE_WORDS = 5
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(MINHASH_PERMUTATIONS)]
+
+
+def _approx_tokens(text: str) -> int:
+    """BPE-like estimate without a vocabulary, usually within ~15% of cl100k for English prose.
+
+    Common ASCII words are one token and long ones split every ~6 characters; non-Latin
+    scripts (e.g. Arabic) average about two characters per token.
+    """
+    tokens = 0
+    for piece in PRETOKEN_RE.findall(text):
+        stripped = piece.strip()
+        if not stripped:
+            tokens += 1 if "\n" in piece or len(piece) > 1 else 0
+        elif stripped.isascii():
+            tokens += 1 + (len(stripped) - 1) // 6
+        else:
+            tokens += math.ceil(len(stripped) / 2)
+    return tokens
+
+
+@functools.lru_cache(maxsize=None)
+def _tokenizer() -> tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken is optional and needs its BPE file cached locally; fall back to the estimate.
+        return "approx", _approx_tokens
+    return "tiktoken:cl100k_base", lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def tokenizer_name() -> str:
+    return _tokenizer()[0]
+
+
+def count_tokens(text: str) -> int:
+    return _tokenizer()[1](text)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    words = WORD_RE.findall(text.lower())
+    grams = [" ".join(words[i : i + size]) for i in range(max(1, len(words) - size + 1))]
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big") for g in grams}
+
+
+def minhash(values: set[int]) -> list[int]:
+    if not values:
+        return []
+    return [min((a * x + b) % _PRIME for x in values) for a, b in _PERMUTATIONS]
+
+
+def similarity(left: list[int], right: list[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    if not left or len(left) != len(right):
+        return 0.0
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def near_duplicates(signatures: Iterable[list[int]], threshold: float = 0.8) -> list[list[int]]:
+    """Group signature indexes whose estimated similarity is >= ``threshold``.
+
+    LSH banding keeps this close to linear: only signatures sharing at least one band
+    are compared. Returns clusters of two or more indexes, each sorted.
+    """
+    signatures = list(signatures)
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for index, signature in enumerate(signatures):
+        if not signature:
+            continue
+        for band in range(LSH_BANDS):
+            buckets.setdefault((band, tuple(signature[band * rows : (band + 1) * rows])), []).append(index)
+
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for pos, left in enumerate(members):
+            for right in members[pos + 1 :]:
+                if (left, right) in checked:
+                    continue
+                checked.add((left, right))
+                if similarity(signatures[left], signatures[right]) >= threshold:
+                    parent[find(right)] = find(left)
+
+    clusters: dict[int, list[int]] = {}
+    for index in range(len(signatures)):
+        clusters.setdefault(find(index), []).append(index)
+    return [members for members in clusters.values() if len(members) > 1]
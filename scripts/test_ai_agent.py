@@ -10,8 +10,8 @@ from bsm_config.src.api.client_factory import APIClientFactory
 
 
 def main():
-    client = APIClientFactory.fromProviders(["openai"]).getPrimaryClient()
-    report = client.generateReport({"title": "CI Test", "data": "health-check"})
+    factory = APIClientFactory.fromProviders(["openai"])
+    report = factory.generateReport({"title": "CI Test", "data": "health-check"})
     assert "content" in report
     print("AI agent test passed")
 
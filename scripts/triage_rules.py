@@ -0,0 +1,141 @@
+"""Configurable PR triage rules compiled into a single multi-pattern matcher."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Iterable
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent / "triage_rules.json"
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex for a keyword trie; optional tails are greedy, so the longest keyword wins."""
+    trie: dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if "" in node:
+            return (body if len(branches) > 1 else f"(?:{body})") + "?"
+        return body
+
+    return emit(trie)
+
+
+class TriageRules:
+    """Priority and decision rules loaded from JSON and compiled once.
+
+    Every title keyword goes into one trie-shaped regex wrapped in a zero-width lookahead,
+    so a single scan reports the longest keyword starting at each position (substring
+    semantics, overlaps included). Any shorter keyword starting at the same position is a
+    prefix of that match, so each keyword maps to the categories of all its keyword
+    prefixes and the scan stays exact. Categories are bit flags: bit ``i`` is priority
+    ``i`` and the last bit is the close-keyword category.
+    """
+
+    def __init__(self, rules: dict[str, Any]) -> None:
+        self.priorities = [p["name"] for p in rules["priorities"]]
+        self.default_priority = rules.get("default_priority", "P2")
+        self.p0 = self.priorities[0]
+        self.p1 = self.priorities[1] if len(self.priorities) > 1 else None
+        thresholds = rules.get("thresholds", {})
+        self.p1_stale_days = thresholds.get("p1_stale_days", 30)
+        self.close_after_days = thresholds.get("close_after_days", 60)
+        self.reasons = rules["reasons"]
+        self.close_bit = 1 << len(self.priorities)
+
+        keyword_bits: dict[str, int] = {}
+        self.label_bits: dict[str, int] = {}
+        for index, priority in enumerate(rules["priorities"]):
+            for keyword in priority.get("title_keywords", []):
+                keyword_bits[keyword.lower()] = keyword_bits.get(keyword.lower(), 0) | 1 << index
+            for label in priority.get("labels", []):
+                self.label_bits[label.lower()] = self.label_bits.get(label.lower(), 0) | 1 << index
+        for keyword in rules.get("close_keywords", []):
+            keyword_bits[keyword.lower()] = keyword_bits.get(keyword.lower(), 0) | self.close_bit
+
+        self.keyword_bits: dict[str, int] = {}
+        for keyword in keyword_bits:
+            mask = 0
+            for other, bits in keyword_bits.items():
+                if keyword.startswith(other):
+                    mask |= bits
+            self.keyword_bits[keyword] = mask
+        self.pattern = re.compile(f"(?=({_trie_pattern(keyword_bits)}))") if keyword_bits else None
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_RULES_PATH) -> "TriageRules":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def title_mask(self, title: str) -> int:
+        mask = 0
+        if self.pattern is not None:
+            for keyword in self.pattern.findall(title.lower()):
+                mask |= self.keyword_bits.get(keyword, 0)
+        return mask
+
+    def batch_title_masks(self, titles: list[str]) -> list[int]:
+        """Keyword category flags per title from a single regex pass over the whole batch."""
+        masks = [0] * len(titles)
+        if self.pattern is None or not titles:
+            return masks
+        starts = []
+        position = 0
+        for title in titles:
+            starts.append(position)
+            position += len(title) + 1
+        # NUL never appears in a keyword, so matches cannot span two titles.
+        text = "\0".join(titles).lower()
+        keyword_bits = self.keyword_bits
+        for match in self.pattern.finditer(text):
+            index = bisect_right(starts, match.start()) - 1
+            masks[index] |= keyword_bits.get(match.group(1), 0)
+        return masks
+
+    def _priority(self, pr: dict[str, Any], mask: int) -> str:
+        for label in pr.get("labels", ()):
+            mask |= self.label_bits.get(label["name"].lower(), 0)
+        for index, name in enumerate(self.priorities):
+            if mask & 1 << index:
+                return name
+        return self.default_priority
+
+    def _decision(self, pr: dict[str, Any], priority: str, now: dt.datetime, mask: int) -> tuple[str, str]:
+        if pr.get("draft"):
+            return "request changes", self.reasons["draft"]
+        if priority == self.p0:
+            return "merge", self.reasons["p0"]
+        age_days = (now - dt.datetime.fromisoformat(pr["created_at"].replace("Z", "+00:00"))).days
+        if priority == self.p1:
+            if age_days > self.p1_stale_days:
+                return "request changes", self.reasons["p1_stale"]
+            return "merge", self.reasons["p1"]
+        if mask & self.close_bit or age_days > self.close_after_days:
+            return "close", self.reasons["close"]
+        return "request changes", self.reasons["default"]
+
+    def classify(self, pr: dict[str, Any]) -> str:
+        return self._priority(pr, self.title_mask(pr.get("title") or ""))
+
+    def decision(self, pr: dict[str, Any], priority: str, now: dt.datetime) -> tuple[str, str]:
+        return self._decision(pr, priority, now, self.title_mask(pr.get("title") or ""))
+
+    def score_batch(self, prs: list[dict[str, Any]], now: dt.datetime) -> list[tuple[str, str, str]]:
+        """Return (priority, action, reason) per PR, scanning all titles in one pass."""
+        masks = self.batch_title_masks([pr.get("title") or "" for pr in prs])
+        results = []
+        for pr, mask in zip(prs, masks):
+            priority = self._priority(pr, mask)
+            results.append((priority, *self._decision(pr, priority, now, mask)))
+        return results
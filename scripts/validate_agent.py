@@ -4,18 +4,26 @@
 from __future__ import annotations
 
 import argparse
-import glob
+import functools
+import hashlib
+import json
+import os
 import re
 import sys
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import yaml
-from pydantic import BaseModel, ConfigDict, ValidationError, create_model
-from pydantic import Field as PydanticField
+from agent_index import DEFAULT_GLOBS, DEFAULT_INDEX_PATH, AgentIndex, find_agent_files, native_front_matter
 
 ROOT = Path(__file__).resolve().parents[1]
 SCHEMA_PATH = ROOT / "scripts" / "schema.yaml"
+DEFAULT_CACHE_PATH = ROOT / ".cache" / "agent-validation.json"
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+# pydantic and yaml are imported inside the functions that need them, so --help and
+# fully cached runs never load them.
 
 
 class DynamicModelFactory:
@@ -23,6 +31,8 @@ class DynamicModelFactory:
 
     @staticmethod
     def _string_field(spec: dict[str, Any]) -> tuple[type[str], Any]:
+        from pydantic import Field as PydanticField
+
         kwargs: dict[str, Any] = {}
         if "minLength" in spec:
             kwargs["min_length"] = spec["minLength"]
@@ -36,6 +46,9 @@ class DynamicModelFactory:
 
     @classmethod
     def _from_spec(cls, name: str, spec: dict[str, Any]) -> tuple[Any, Any]:
+        from pydantic import ConfigDict, create_model
+        from pydantic import Field as PydanticField
+
         spec_type = spec.get("type", "string")
 
         if spec_type == "string":
@@ -61,6 +74,8 @@ class DynamicModelFactory:
 
     @classmethod
     def build_root_model(cls, schema: dict[str, Any]) -> type[BaseModel]:
+        from pydantic import ConfigDict, create_model
+
         fields: dict[str, tuple[Any, Any]] = {}
         for key, spec in schema.items():
             field_type, field_def = cls._from_spec(f"Root_{key}", spec)
@@ -69,61 +84,148 @@ class DynamicModelFactory:
 
 
 def load_schema() -> dict[str, Any]:
+    import yaml
+
     if not SCHEMA_PATH.exists():
         raise FileNotFoundError(f"Schema not found: {SCHEMA_PATH}")
     with SCHEMA_PATH.open("r", encoding="utf-8") as handle:
         return yaml.safe_load(handle) or {}
 
 
-def extract_front_matter(path: Path) -> dict[str, Any]:
-    content = path.read_text(encoding="utf-8")
-    if content.startswith("---\n"):
-        chunks = content.split("---\n", 2)
-        if len(chunks) >= 3:
-            parsed = yaml.safe_load(chunks[1])
-            if isinstance(parsed, dict):
-                return parsed
-    parsed = yaml.safe_load(content)
-    if isinstance(parsed, dict):
-        return parsed
-    raise ValueError("File does not contain a YAML object or YAML front matter")
+def schema_hash() -> str:
+    return hashlib.sha256(SCHEMA_PATH.read_bytes()).hexdigest() if SCHEMA_PATH.exists() else ""
+
+
+@functools.lru_cache(maxsize=4)
+def model_for_schema(digest: str) -> type[BaseModel]:
+    """Build the root model once per schema content hash and reuse it for later calls."""
+    return DynamicModelFactory.build_root_model(load_schema())
+
+
+def validate_entry(model: type[BaseModel], entry: dict[str, Any]) -> str | None:
+    """Return None when the indexed file is valid, otherwise the error text."""
+    from pydantic import ValidationError
+
+    if entry["front_matter"] is None:
+        return entry["error"]
+    try:
+        model.model_validate(native_front_matter(entry))
+    except ValidationError as exc:
+        return str(exc)
+    return None
 
 
-def resolve_targets(globs: list[str]) -> list[Path]:
-    matched: list[Path] = []
-    for pattern in globs:
-        matched.extend(Path(p).resolve() for p in glob.glob(pattern))
-    unique_sorted = sorted(set(matched))
-    return [p for p in unique_sorted if p.is_file()]
+_WORKER_MODEL: type[BaseModel] | None = None
+
+
+def _init_worker(digest: str) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = model_for_schema(digest)
+
+
+def _validate_in_worker(entry: dict[str, Any]) -> str | None:
+    return validate_entry(_WORKER_MODEL, entry)
+
+
+class ValidationCache:
+    """Validation results keyed on each file's content hash, invalidated when the schema changes."""
+
+    def __init__(self, path: Path, schema_hash: str) -> None:
+        self.path = path
+        self.schema_hash = schema_hash
+        self.files: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+            if data.get("schema_hash") == schema_hash:
+                self.files = data.get("files", {})
+
+    def lookup(self, entry: dict[str, Any]) -> tuple[bool, str | None]:
+        cached = self.files.get(entry["path"])
+        if cached and cached["sha256"] == entry["sha256"]:
+            return True, cached["error"]
+        return False, None
+
+    def store(self, entry: dict[str, Any], error: str | None) -> None:
+        self.files[entry["path"]] = {"sha256": entry["sha256"], "error": error}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"schema_hash": self.schema_hash, "files": self.files}
+        self.path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
 
 
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--glob", action="append", default=[], help="Glob for .agent.md files")
     parser.add_argument("--file", action="append", default=[], help="Explicit file(s) to validate")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Shared agent-file index")
+    parser.add_argument("--cache-file", default=str(DEFAULT_CACHE_PATH), help="Validation result cache")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild the index and revalidate every file")
+    parser.add_argument("--jobs", type=int, default=1, help="Validate changed files across N processes")
     args = parser.parse_args()
 
     targets = [Path(f).resolve() for f in args.file]
-    targets.extend(resolve_targets(args.glob or ["agents/*.agent.md", ".github/agents/*.agent.md"]))
+    targets.extend(find_agent_files(args.glob or DEFAULT_GLOBS))
     targets = sorted(set(targets))
 
     if not targets:
         print("No agent files found; skipping validation.")
         return 0
 
-    schema = load_schema()
-    model = DynamicModelFactory.build_root_model(schema)
+    index = AgentIndex(args.index, fresh=args.no_cache)
+    entries = index.refresh(targets)
+    index.save()
+
+    digest = schema_hash()
+    cache = ValidationCache(Path(args.cache_file), digest) if not args.no_cache else None
+
+    results: list[str | None] = [None] * len(entries)
+    cached: set[int] = set()
+    pending: list[int] = []
+    for position, entry in enumerate(entries):
+        hit, error = cache.lookup(entry) if cache is not None else (False, None)
+        if hit:
+            results[position] = error
+            cached.add(position)
+        else:
+            pending.append(position)
+
+    if pending:
+        # The model is only built when at least one file actually needs validating.
+        if args.jobs > 1 and len(pending) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=min(args.jobs, len(pending), os.cpu_count() or 1),
+                initializer=_init_worker,
+                initargs=(digest,),
+            ) as pool:
+                errors = pool.map(_validate_in_worker, [entries[p] for p in pending])
+                for position, error in zip(pending, errors):
+                    results[position] = error
+        else:
+            model = model_for_schema(digest)
+            for position in pending:
+                results[position] = validate_entry(model, entries[position])
 
     failures = 0
-    for target in targets:
-        try:
-            payload = extract_front_matter(target)
-            model.model_validate(payload)
-            print(f"✅ {target.relative_to(ROOT)}")
-        except (ValidationError, ValueError, yaml.YAMLError) as exc:
+    for position, (target, entry) in enumerate(zip(targets, entries)):
+        error = results[position]
+        suffix = " (cached)" if position in cached else ""
+        if error is None:
+            print(f"✅ {target.relative_to(ROOT)}{suffix}")
+        else:
             failures += 1
-            print(f"❌ {target.relative_to(ROOT)}")
-            print(exc)
+            print(f"❌ {target.relative_to(ROOT)}{suffix}")
+            print(error)
+        if cache is not None and position not in cached:
+            cache.store(entry, error)
+
+    if cache is not None:
+        cache.save()
 
     return 1 if failures else 0
 
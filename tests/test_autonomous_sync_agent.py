@@ -0,0 +1,100 @@
+"""Offline daemon cycles of the BSU Nexus agent against a stub Cloudflare zone."""
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "agents", ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from stub_servers import CloudflareStub, StubProfile, StubState
+
+pytest.importorskip("requests")
+
+
+class ZoneStub(CloudflareStub):
+    """CloudflareStub that applies batch writes and bumps the SOA serial it serves over DoH."""
+
+    def __init__(self, state):
+        super().__init__(state)
+        self.records = [state.dns_record(i) for i in range(state.dns_record_count)]
+        self.serial = 1
+        self.writes = 0
+        self._zone_lock = threading.Lock()
+
+    def route(self, method, path):
+        if method == "GET" and path == "/dns-query":
+            return self.soa
+        return super().route(method, path)
+
+    def soa(self, handler, query, body):
+        domain = self.state.domain
+        answer = {"data": f"ns1.{domain} dns.{domain} {self.serial} 10000 2400 604800 3600"}
+        handler._json(200, {"Status": 0, "Answer": [answer]})
+
+    def dns_records(self, handler, query, body):
+        per_page = int(query.get("per_page", 100))
+        page = int(query.get("page", 1))
+        with self._zone_lock:
+            records = list(self.records)
+        result = records[(page - 1) * per_page : page * per_page]
+        info = {
+            "page": page,
+            "per_page": per_page,
+            "count": len(result),
+            "total_count": len(records),
+            "total_pages": max(1, -(-len(records) // per_page)),
+        }
+        handler._json(200, {"success": True, "errors": [], "result": result, "result_info": info})
+
+    def batch(self, handler, query, body):
+        request = json.loads(body or b"{}")
+        with self._zone_lock:
+            deleted = {item["id"] for item in request.get("deletes", [])}
+            self.records = [record for record in self.records if record["id"] not in deleted]
+            by_id = {record["id"]: record for record in self.records}
+            for patch in request.get("patches", []):
+                by_id[patch["id"]].update(patch)
+            for index, post in enumerate(request.get("posts", [])):
+                self.records.append({"id": f"new{self.writes}-{index}", **post})
+            self.serial += 1
+            self.writes += 1
+        super().batch(handler, query, body)
+
+
+def test_cycle_after_own_write_is_skipped(tmp_path, monkeypatch):
+    state = StubState(StubProfile(latency=0.0, payload_bytes=64), dns_record_count=120)
+    desired = tmp_path / "dns.desired.json"
+    drifted = {**state.dns_record(1), "ttl": 600}
+    missing = {"type": "TXT", "name": "daemon", "content": "offline-test", "ttl": 300}
+    desired.write_text(json.dumps({"prune": False, "records": [drifted, missing]}), encoding="utf-8")
+
+    with ZoneStub(state) as stub:
+        monkeypatch.chdir(ROOT)
+        for name, value in {
+            "CLOUDFLARE_TOKEN": "offline",
+            "CLOUDFLARE_ZONE_ID": "zone",
+            "CLOUDFLARE_API_URL": stub.url,
+            "NEXUS_DOH_URL": f"{stub.url}/dns-query",
+            "NEXUS_DNS_DESIRED": str(desired),
+            "NEXUS_DNS_SNAPSHOT": str(tmp_path / "dns-snapshot.json"),
+            "NEXUS_SYNC_INTERVAL": "0.05",
+        }.items():
+            monkeypatch.setenv(name, value)
+        from autonomous_sync_agent import BSUNexusAgent
+
+        agent = BSUNexusAgent()
+        asyncio.run(agent.run_daemon(max_cycles=2))
+
+    assert stub.writes == 1
+    assert agent.stats["errors"] == 0
+    assert agent.stats["batch_writes"] == 1
+    # The second cycle sees the zone exactly as the first one left it and does no work.
+    assert agent.stats["full_syncs"] == 1
+    assert agent.stats["skipped"] == 1
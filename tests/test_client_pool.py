@@ -0,0 +1,119 @@
+"""Offline checks for ProviderClientPool routing, using FakeProviderClient."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bsm_config.src.api.client_pool import ProviderClientPool
+from bsm_config.src.api.fake_provider import FakeProviderClient
+
+
+def _pool(hedge_delay=None):
+    clients = {
+        "slow": FakeProviderClient("slow", latency=0.2),
+        "fast": FakeProviderClient("fast", latency=0.01),
+    }
+    return ProviderClientPool(clients, hedge_delay=hedge_delay)
+
+
+def _run_calls(pool, count):
+    async def calls():
+        for index in range(count):
+            await pool.call("generateReport", {"title": f"r{index}"})
+
+    asyncio.run(calls())
+
+
+def test_hedge_loser_is_sampled_and_demoted():
+    pool = _pool(hedge_delay=0.05)
+    _run_calls(pool, 5)
+
+    assert pool.ranked() == ["fast", "slow"]
+    assert len(pool.stats["slow"].latencies) >= 1
+    assert pool.stats["slow"].percentile(50) >= 0.05
+    # Once "fast" leads, later calls finish without waiting out the hedge delay.
+    assert pool.clients["slow"].calls <= 2
+
+
+def test_untried_provider_ranks_at_median_not_first():
+    pool = _pool()
+    for _ in range(3):
+        pool.stats["fast"].record_success(0.01)
+
+    assert pool.ranked() == ["fast", "slow"]
+
+
+def test_fallback_without_hedging_prefers_faster_provider():
+    pool = _pool()
+    _run_calls(pool, 4)
+
+    assert pool.ranked()[0] == "fast"
+
+
+def test_factory_shared_across_threads_does_not_hang():
+    import threading
+
+    from bsm_config.src.api.client_factory import APIClientFactory
+    from bsm_config.src.api.provider_benchmark import benchmark_round
+
+    clients = {name: FakeProviderClient(name, latency=0.01) for name in ("a", "b")}
+    factory = APIClientFactory(["a", "b"], clients=clients, cache=None, max_connections=2)
+    results = []
+
+    def session():
+        results.append(factory.runSync(benchmark_round(factory.pool, {"title": "t"}, 10)))
+
+    threads = [threading.Thread(target=session) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(results) == 3
+    assert all(round_["providers"][name]["error_rate"] == 0 for round_ in results for name in ("a", "b"))
+
+
+def _fail_directly(pool, name, count):
+    async def calls():
+        for _ in range(count):
+            try:
+                await pool.invoke(name, "generateReport", {"title": "fail"})
+            except Exception:
+                pass
+
+    pool.clients[name].error_rate = 1.0
+    asyncio.run(calls())
+    pool.clients[name].error_rate = 0.0
+
+
+def test_single_failure_does_not_demote_provider():
+    pool = _pool()
+    _fail_directly(pool, "fast", 1)
+
+    assert pool.stats["fast"].error_rate == 1.0
+    assert pool.stats["fast"].healthy
+    _run_calls(pool, 20)
+    assert pool.ranked()[0] == "fast"
+    assert pool.clients["slow"].calls <= 2
+
+
+def test_tripped_provider_recovers_after_cooldown():
+    import time
+
+    pool = _pool()
+    pool.stats["fast"].cooldown = 0.05
+    _fail_directly(pool, "fast", 3)
+    assert not pool.stats["fast"].healthy
+    assert pool.ranked()[0] == "slow"
+
+    time.sleep(0.06)
+    before = pool.clients["fast"].calls
+    _run_calls(pool, 20)
+
+    assert pool.stats["fast"].healthy
+    assert pool.stats["fast"].error_rate == 0.0
+    assert pool.clients["fast"].calls - before >= 19
@@ -0,0 +1,29 @@
+"""Offline checks for the incremental CSV digest checkpoint."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from csv_digest import digest_csv, digest_csv_incremental
+
+
+def test_unterminated_row_completed_by_append_matches_full_digest(tmp_path):
+    data = tmp_path / "data.csv"
+    checkpoint = tmp_path / "checkpoint.json"
+    data.write_text("amount,kind\n1,x\n2,y\n3,z", encoding="utf-8")
+
+    first, mode = digest_csv_incremental(data, checkpoint, group_by="kind")
+    assert mode == "full"
+    assert first.summary() == digest_csv(data, group_by="kind").summary()
+
+    # Finish the dangling "3,z" row (as "30,z") and add two more rows.
+    with data.open("a", encoding="utf-8") as handle:
+        handle.write("0,z\n4,w\n5,v\n")
+
+    second, mode = digest_csv_incremental(data, checkpoint, group_by="kind")
+    assert mode == "incremental"
+    assert second.rows == 5
+    assert second.summary() == digest_csv(data, group_by="kind").summary()
@@ -0,0 +1,73 @@
+"""Offline checks for the DNS desired-state diff."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "agents") not in sys.path:
+    sys.path.insert(0, str(ROOT / "agents"))
+
+from dns_state import DNSSnapshot, diff
+
+DOMAIN = "corehub.nexus"
+
+
+def _record(record_id, record_type, name, content, **fields):
+    record = {"id": record_id, "type": record_type, "name": f"{name}.{DOMAIN}", "content": content}
+    return {**record, "ttl": 300, "proxied": False, "comment": None, **fields}
+
+
+def _desired(records, prune=False):
+    return {
+        "prune": prune,
+        "records": [{key: value for key, value in record.items() if key != "id"} for record in records],
+    }
+
+
+SNAPSHOT = DNSSnapshot(
+    [
+        _record("rec1", "A", "www", "10.0.0.1"),
+        _record("rec2", "A", "www", "10.0.0.2"),
+        _record("rec3", "CNAME", "docs", "pages.example.com"),
+        _record("rec4", "TXT", "old", "stale"),
+    ]
+)
+
+
+def test_matching_state_is_a_noop():
+    desired = _desired(SNAPSHOT.records[:3])
+    # Content comparison ignores case and the trailing dot on hostnames.
+    desired["records"][2]["content"] = "Pages.Example.com."
+
+    assert diff(SNAPSHOT, desired) == {}
+
+
+def test_changed_records_are_patched_in_place():
+    desired = _desired(
+        [
+            _record(None, "A", "www", "10.0.0.1", ttl=600),
+            _record(None, "A", "www", "10.0.0.9"),
+            _record(None, "CNAME", "docs", "pages.example.com"),
+        ]
+    )
+
+    batch = diff(SNAPSHOT, desired)
+
+    # rec2's content is no longer wanted, so it is repurposed instead of deleted and re-created.
+    assert batch == {"patches": [{"id": "rec1", "ttl": 600}, {"id": "rec2", "content": "10.0.0.9"}]}
+
+
+def test_missing_records_are_created():
+    desired = _desired(SNAPSHOT.records[:3] + [_record(None, "TXT", "new", "hello")])
+
+    assert diff(SNAPSHOT, desired) == {"posts": [desired["records"][-1]]}
+    assert desired["records"][-1]["name"] == f"new.{DOMAIN}"
+
+
+def test_unmanaged_records_are_only_deleted_when_pruning():
+    desired = _desired(SNAPSHOT.records[:3])
+    desired["records"].pop(1)
+
+    # Without prune, only extras within a managed (name, type) are removed.
+    assert diff(SNAPSHOT, desired) == {"deletes": [{"id": "rec2"}]}
+    assert diff(SNAPSHOT, {**desired, "prune": True}) == {"deletes": [{"id": "rec2"}, {"id": "rec4"}]}
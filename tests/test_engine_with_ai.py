@@ -0,0 +1,113 @@
+"""Offline checks for streaming agent insights from core/engine-with-ai.py."""
+
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import core
+
+
+def _load_engine_module():
+    # The file name is hyphenated, so load it by path as core.engine_with_ai to keep
+    # its relative ``from .engine import`` working.
+    name = "core.engine_with_ai"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, ROOT / "core" / "engine-with-ai.py")
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = core.__name__
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+BSM_AI_Engine = _load_engine_module().BSM_AI_Engine
+
+
+class FakeAIClient:
+    async def analyzeData(self, result):
+        return {"summary": result["agent"], "recommendations": [f"review {result['agent']}"]}
+
+
+def _engine(delays, started=None, cancelled=None):
+    """Engine with in-memory agents whose handlers sleep for ``delays[name]`` seconds."""
+    engine = BSM_AI_Engine.__new__(BSM_AI_Engine)
+    engine.config = {}
+    engine.agents = {name: {"id": name, "role": name} for name in delays}
+    engine.handlers = {}
+    engine.ai_client = FakeAIClient()
+
+    def handler_for(name):
+        async def handler(agent, context):
+            if started is not None:
+                started.append(name)
+            try:
+                await asyncio.sleep(delays[name])
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.append(name)
+                raise
+            return {"done": name}
+
+        return handler
+
+    for name in delays:
+        engine.register_handler(name, handler_for(name))
+    return engine
+
+
+async def _collect(stream):
+    return [item async for item in stream]
+
+
+def test_results_stream_in_completion_order():
+    engine = _engine({"slow": 0.15, "medium": 0.08, "fast": 0.01})
+
+    results = asyncio.run(_collect(engine.execute_agents_with_ai_insight(["slow", "medium", "fast"], {})))
+
+    assert [item["agent"] for item in results] == ["fast", "medium", "slow"]
+    assert results[0]["agent_result"]["output"] == {"done": "fast"}
+    assert results[0]["recommendations"] == ["review fast"]
+
+
+def test_unknown_agent_is_reported_inline():
+    engine = _engine({"known": 0.02})
+
+    results = asyncio.run(_collect(engine.execute_agents_with_ai_insight(["missing", "known"], {})))
+
+    by_agent = {item["agent"]: item for item in results}
+    assert set(by_agent) == {"missing", "known"}
+    assert by_agent["missing"] == {"agent": "missing", "error": "Unknown agent: missing"}
+    assert by_agent["known"]["agent_result"]["status"] == "completed"
+
+
+def test_stopping_early_cancels_pending_agents():
+    started = []
+    cancelled = []
+    engine = _engine({"fast": 0.01, "slow1": 5.0, "slow2": 5.0}, started=started, cancelled=cancelled)
+
+    async def first_only():
+        stream = engine.execute_agents_with_ai_insight(["slow1", "fast", "slow2"], {})
+        try:
+            async for item in stream:
+                return item
+        finally:
+            await stream.aclose()
+
+    async def scenario():
+        item = await asyncio.wait_for(first_only(), timeout=2)
+        # Let the cancelled tasks run their CancelledError handlers; check before
+        # asyncio.run() would cancel any leftovers on its own.
+        await asyncio.sleep(0)
+        return item, list(cancelled)
+
+    item, cancelled_before_exit = asyncio.run(scenario())
+
+    assert item["agent"] == "fast"
+    assert sorted(started) == ["fast", "slow1", "slow2"]
+    assert sorted(cancelled_before_exit) == ["slow1", "slow2"]
@@ -0,0 +1,27 @@
+"""Offline checks for the keep-alive GitHub client against the local stub server."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "scripts", ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from github_http import GitHubClient
+from stub_servers import GitHubStub, StubProfile, StubState
+
+
+def test_close_closes_every_worker_connection():
+    with GitHubStub(StubState(StubProfile(latency=0.01, payload_bytes=64))) as stub:
+        client = GitHubClient(api_url=stub.url, cache_dir=None, token="offline", max_workers=4)
+        pulls = client.get_paginated("/repos/bsm/offline/pulls", {"state": "open"}, per_page=25)
+        connections = list(client._connections)
+
+        client.close()
+
+    assert len(pulls) == stub.state.pull_count
+    # Page 1 on the calling thread plus the pool workers for the remaining pages.
+    assert len(connections) == client.stats["connections"] > 1
+    assert all(conn.sock is None for conn in connections)
+    assert client._connections == []
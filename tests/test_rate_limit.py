@@ -0,0 +1,58 @@
+"""Offline checks for the provider rate limiter shared across event loops."""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bsm_config.src.api.client_factory import APIClientFactory
+from bsm_config.src.api.fake_provider import FakeProviderClient
+from bsm_config.src.api.rate_limit import AdaptiveConcurrency
+
+
+def test_routed_client_from_several_loops_does_not_hang():
+    clients = {"a": FakeProviderClient("a", latency=0.01)}
+    factory = APIClientFactory(["a"], clients=clients, cache=None, max_connections=1)
+    finished = []
+
+    async def session():
+        routed = factory.getRoutedClient()
+        await asyncio.gather(*(routed.generateReport({"title": f"r{i}"}) for i in range(4)))
+
+    def run():
+        asyncio.run(session())
+        finished.append(True)
+
+    threads = [threading.Thread(target=run, daemon=True) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(finished) == 2
+    assert factory.pool.limiters["a"].concurrency.inflight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveConcurrency(1)
+
+    async def scenario():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await limiter.release("success")
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            pass
+        # The slot must be free again for a new caller.
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+        await limiter.release("success")
+
+    asyncio.run(scenario())
+    assert limiter.inflight == 0